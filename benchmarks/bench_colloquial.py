@@ -0,0 +1,67 @@
+"""口语化时间描述的基准测试。
+
+循环提醒的描述同时测量改用 trigger.fields 之前的实现（colloquial_before.py）作为对比。
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from apscheduler.triggers.cron import CronTrigger
+from colloquial_before import colloquial_crontrigger as colloquial_crontrigger_before
+
+from nonebot_plugin_remind import colloquial
+
+_rng = random.Random(0)
+_now = datetime.now().replace(second=0, microsecond=0)
+DATETIMES = [
+    _now + timedelta(minutes=_rng.randrange(-60 * 24, 60 * 24 * 800))
+    for _ in range(200)
+]
+TRIGGERS = [
+    CronTrigger(
+        day_of_week=_rng.choice(["*", "mon-fri", "sat,sun", "wed", "fri,mon"]),
+        day=_rng.choice(["*", "*", "1", "15"]),
+        hour=_rng.choice(["8", "9-17", "*/2", "20"]),
+        minute=_rng.choice(["0", "30", "*/15"]),
+    )
+    for _ in range(200)
+]
+
+
+def _describe_datetimes():
+    return [colloquial.colloquial_datetime(dt) for dt in DATETIMES]
+
+
+def _describe_triggers():
+    return [colloquial.colloquial_crontrigger(trigger) for trigger in TRIGGERS]
+
+
+def bench_colloquial_datetime(benchmark):
+    benchmark(_describe_datetimes)
+
+
+@pytest.mark.benchmark(group="crontrigger")
+def bench_colloquial_crontrigger_before(benchmark):
+    """str(trigger) + 正则表达式的旧实现，描述与新实现一致"""
+    results = benchmark(
+        lambda: [colloquial_crontrigger_before(trigger) for trigger in TRIGGERS]
+    )
+    assert results == _describe_triggers()
+
+
+@pytest.mark.benchmark(group="crontrigger")
+def bench_colloquial_crontrigger(benchmark):
+    """列表中的循环提醒大多共用相同的时间设置"""
+    benchmark(_describe_triggers)
+
+
+@pytest.mark.benchmark(group="crontrigger")
+def bench_colloquial_crontrigger_uncached(benchmark):
+    benchmark.pedantic(
+        _describe_triggers,
+        setup=colloquial._cron_desc_cache.clear,
+        rounds=200,
+    )
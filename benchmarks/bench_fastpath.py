@@ -0,0 +1,36 @@
+"""快速解析与 jionlp 的耗时对比，语料为插件说明中快速解析能得出结果的时间表达式。"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+from datetime import datetime
+
+import pytest
+from conftest import usage_time_expressions
+
+from nonebot_plugin_remind.fastpath import fast_parse_time
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import jionlp as jio
+
+BASE = datetime.now().replace(microsecond=0)
+CORPUS = [
+    text for text in usage_time_expressions() if fast_parse_time(text, BASE) is not None
+]
+
+
+@pytest.mark.benchmark(group="fastpath")
+def bench_fast_parse_time(benchmark):
+    results = benchmark(lambda: [fast_parse_time(text, BASE) for text in CORPUS])
+    assert None not in results
+
+
+@pytest.mark.benchmark(group="fastpath")
+def bench_jionlp_parse_time(benchmark):
+    timestamp = BASE.timestamp()
+    jio.parse_time(CORPUS[0], time_base=timestamp)
+    benchmark.pedantic(
+        lambda: [jio.parse_time(text, time_base=timestamp) for text in CORPUS],
+        rounds=10,
+    )
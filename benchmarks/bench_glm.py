@@ -0,0 +1,51 @@
+"""GLM-4 批量解析的基准测试。
+
+使用 tests/glm_server.py 中代替智谱接口的本地 HTTP 服务（每个请求延迟 API_LATENCY 秒），
+同时解析 CONCURRENT 条文本，比较合并为一次调用与逐条调用的耗时和请求数。
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from tests.glm_server import ANSWER
+
+from nonebot_plugin_remind import glm4
+from nonebot_plugin_remind.config import remind_config
+
+API_LATENCY = 0.1
+CONCURRENT = 10
+TEXTS = [f"{day}天后早上{hour}点" for day in range(2, 4) for hour in range(7, 12)]
+
+
+async def _parse_all() -> list[str]:
+    return await asyncio.gather(*map(glm4.parsed_datetime_glm4, TEXTS))
+
+
+def _bench(benchmark, run, server) -> None:
+    server.latency = API_LATENCY
+    results = benchmark.pedantic(
+        lambda: run(_parse_all()), setup=server.requests.clear, rounds=5
+    )
+    assert results == [ANSWER] * CONCURRENT
+    benchmark.extra_info["requests"] = len(server.requests)
+
+
+@pytest.fixture
+def sync_mode(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(remind_config, "glm_completion_mode", "sync")
+
+
+@pytest.mark.benchmark(group="glm-batch")
+def bench_glm_unbatched(benchmark, run, glm_server, sync_mode):
+    _bench(benchmark, run, glm_server)
+    assert len(glm_server.requests) == CONCURRENT
+
+
+@pytest.mark.benchmark(group="glm-batch")
+def bench_glm_batched(benchmark, run, glm_server, sync_mode, monkeypatch):
+    monkeypatch.setattr(remind_config, "glm_batch_window", 0.02)
+    _bench(benchmark, run, glm_server)
+    # 第一条直接发送，其余合并为一次调用
+    assert len(glm_server.requests) == 2
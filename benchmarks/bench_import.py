@@ -0,0 +1,80 @@
+"""插件导入耗时的基准测试。
+
+每轮在新的解释器中初始化 NoneBot 并加载插件，与只初始化 NoneBot 的耗时相比较，
+两者之差即为插件本身的导入开销；jionlp 和 zhipuai 应在首次使用时才导入。
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = """
+import json
+import sys
+
+import nonebot
+from nonebot.adapters.onebot.v11 import Adapter
+
+nonebot.init(
+    driver="~none",
+    log_level="WARNING",
+    localstore_data_dir={store!r} + "/data",
+    localstore_cache_dir={store!r} + "/cache",
+    localstore_config_dir={store!r} + "/config",
+    localstore_use_cwd=False,
+)
+nonebot.get_driver().register_adapter(Adapter)
+{load}
+print(json.dumps(sorted(name for name in ("jionlp", "zhipuai") if name in sys.modules)))
+"""
+
+# 在项目根目录中运行，使用当前代码而不是已安装的插件
+_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def store_dir():
+    with tempfile.TemporaryDirectory(prefix="remind-bench-") as path:
+        yield path
+
+
+def _run_script(store: str, load: str) -> list[str]:
+    script = _SCRIPT.format(store=store, load=load)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # jionlp 导入时会输出推广信息，结果在最后一行
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.benchmark(group="import")
+def bench_import_nonebot_only(benchmark, store_dir):
+    benchmark.pedantic(_run_script, args=(store_dir, ""), rounds=5)
+
+
+@pytest.mark.benchmark(group="import")
+def bench_import_plugin(benchmark, store_dir):
+    loaded = benchmark.pedantic(
+        _run_script,
+        args=(store_dir, 'nonebot.load_plugin("nonebot_plugin_remind")'),
+        rounds=5,
+    )
+    assert loaded == []
+
+
+@pytest.mark.benchmark(group="import")
+def bench_import_plugin_with_jionlp(benchmark, store_dir):
+    """插件导入时即导入 jionlp 的耗时，即延迟导入前的情况"""
+    load = 'nonebot.load_plugin("nonebot_plugin_remind")\nimport jionlp'
+    loaded = benchmark.pedantic(_run_script, args=(store_dir, load), rounds=5)
+    assert loaded == ["jionlp"]
@@ -0,0 +1,64 @@
+"""任务对象的内存占用，比较 100k 个 Task 与改用 Task 之前的任务字典。
+
+两种形式的字段值共用同一批对象，测得的差值即为容器本身的开销；
+各自占用的字节数记录在结果的 extra_info 中（--benchmark-json 可查看）。
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+from conftest import make_tasks, task_as_dict
+
+from nonebot_plugin_remind.model import Task
+
+TASK_COUNT = 100_000
+
+
+@pytest.fixture(scope="module")
+def tasks() -> list[Task]:
+    return make_tasks(TASK_COUNT)
+
+
+def _clone(task: Task) -> Task:
+    return Task(
+        task.task_id,
+        task.reminder_user_id,
+        task.user_ids,
+        task.type,
+        task.remind_time,
+        task.reminder_message,
+        task.is_group,
+        task.group_id,
+    )
+
+
+def _traced_size(build, tasks: list[Task]) -> int:
+    """build 生成的全部对象占用的字节数"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        built = [build(task) for task in tasks]
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del built
+    return size
+
+
+@pytest.mark.benchmark(group="memory-100k")
+def bench_memory_task(benchmark, tasks):
+    size = _traced_size(_clone, tasks)
+    benchmark.extra_info["bytes"] = size
+    benchmark.extra_info["bytes_per_task"] = size / TASK_COUNT
+    benchmark.pedantic(lambda: [_clone(task) for task in tasks], rounds=5)
+    assert size < _traced_size(task_as_dict, tasks)
+
+
+@pytest.mark.benchmark(group="memory-100k")
+def bench_memory_dict(benchmark, tasks):
+    size = _traced_size(task_as_dict, tasks)
+    benchmark.extra_info["bytes"] = size
+    benchmark.extra_info["bytes_per_task"] = size / TASK_COUNT
+    benchmark.pedantic(lambda: [task_as_dict(task) for task in tasks], rounds=5)
@@ -0,0 +1,59 @@
+"""时间解析的基准测试，语料为插件说明中列出的时间表达式。"""
+
+from __future__ import annotations
+
+import pytest
+from conftest import usage_time_expressions
+
+from nonebot_plugin_remind import parse
+
+CORPUS = usage_time_expressions()
+# 关键词触发时提醒人之后的部分：时间 + 提醒内容
+MIXED_CORPUS = [f"{expr}去吃夜宵" for expr in CORPUS]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warm_up():
+    parse.warm_up_jionlp()
+
+
+def _parse_all(run, corpus):
+    async def parse_all():
+        return [await parse.parse_time(text) for text in corpus]
+
+    return run(parse_all())
+
+
+def _extract_all(run, corpus):
+    async def extract_all():
+        return [await parse.extract_time_and_message(text) for text in corpus]
+
+    return run(extract_all())
+
+
+def _clear_cache():
+    parse._jionlp_cache.clear()
+    parse._jionlp_seen.clear()
+
+
+def bench_parse_time_cold(benchmark, run):
+    """每轮都清空 jionlp 解析缓存"""
+    results = benchmark.pedantic(
+        _parse_all,
+        args=(run, CORPUS),
+        setup=_clear_cache,
+        rounds=20,
+    )
+    assert sum(r is not None for r in results) >= len(CORPUS) - 1
+
+
+def bench_parse_time_cached(benchmark, run):
+    # 第二次未命中时才写入缓存
+    _parse_all(run, CORPUS)
+    _parse_all(run, CORPUS)
+    benchmark(_parse_all, run, CORPUS)
+
+
+def bench_extract_time_and_message(benchmark, run):
+    results = benchmark.pedantic(_extract_all, args=(run, MIXED_CORPUS), rounds=10)
+    assert all(parsed is not None for parsed, _ in results)
@@ -0,0 +1,104 @@
+"""提醒列表渲染的基准测试。
+
+用模拟的机器人代替协议端，每次接口调用延迟 API_LATENCY 秒，渲染一个 50 个任务的列表；
+每轮前清空昵称缓存，测得的是首次列出时的耗时。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import nonebot
+import pytest
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+
+from nonebot_plugin_remind.config import remind_config
+from nonebot_plugin_remind.model import Task, TaskType
+from nonebot_plugin_remind.nickname import nickname_cache
+from nonebot_plugin_remind.utils import at_to_text, render_task_texts
+
+API_LATENCY = 0.01
+LIST_SIZE = 50
+GROUP_ID = 900_000
+
+
+class FakeBot:
+    """只实现查询群成员的两个接口"""
+
+    async def call_api(self, api: str, **data):
+        await asyncio.sleep(API_LATENCY)
+        if api == "get_group_member_list":
+            return [
+                {"user_id": user_id, "card": "", "nickname": f"成员{user_id}"}
+                for user_id in range(100_000, 100_000 + LIST_SIZE * 3)
+            ]
+        if api == "get_group_member_info":
+            user_id = data["user_id"]
+            return {"user_id": user_id, "card": "", "nickname": f"成员{user_id}"}
+        raise ValueError(api)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fake_bot():
+    mp = pytest.MonkeyPatch()
+    mp.setattr(nonebot, "get_bot", lambda *args: FakeBot())
+    yield
+    mp.undo()
+
+
+@pytest.fixture(params=["info", "list"])
+def lookup(request):
+    mp = pytest.MonkeyPatch()
+    mp.setattr(remind_config, "remind_nickname_lookup", request.param)
+    yield request.param
+    mp.undo()
+
+
+@pytest.fixture(scope="module")
+def tasks() -> list[Task]:
+    """每个任务 at 1~3 个不同的群成员"""
+    now = datetime.now()
+    return [
+        Task(
+            task_id=f"render{i:02d}",
+            reminder_user_id=100_000,
+            user_ids=Message(
+                MessageSegment.at(100_000 + i * 3 + k) for k in range(i % 3 + 1)
+            ),
+            type=TaskType.DATETIME,
+            remind_time=now + timedelta(hours=i),
+            reminder_message=Message(f"提醒内容 {i}"),
+            is_group=True,
+            group_id=GROUP_ID,
+        )
+        for i in range(LIST_SIZE)
+    ]
+
+
+def _clear_nicknames():
+    nickname_cache.invalidate(GROUP_ID)
+
+
+async def _render_sequential(tasks: list[Task]) -> list[str]:
+    """并发渲染之前的做法：逐个任务、逐个被 at 的人查询"""
+    return [
+        await at_to_text(task.group_id, task.user_ids) + str(task.reminder_message)
+        for task in tasks
+    ]
+
+
+@pytest.mark.benchmark(group="render-50")
+def bench_render_concurrent(benchmark, run, tasks, lookup):
+    texts = benchmark.pedantic(
+        lambda: run(render_task_texts(tasks)), setup=_clear_nicknames, rounds=5
+    )
+    assert "未知用户" not in "".join(texts)
+
+
+@pytest.mark.benchmark(group="render-50")
+def bench_render_sequential(benchmark, run, tasks, lookup):
+    texts = benchmark.pedantic(
+        lambda: run(_render_sequential(tasks)), setup=_clear_nicknames, rounds=3
+    )
+    assert "未知用户" not in "".join(texts)
@@ -0,0 +1,104 @@
+"""任务库相关操作的基准测试，分别使用 1k、10k、100k 个任务的合成任务库。"""
+
+from __future__ import annotations
+
+import jsonpickle
+import pytest
+from conftest import (
+    HEAVY_USER,
+    STORE_SIZES,
+    make_legacy_tasks,
+    make_tasks,
+    task_as_dict,
+)
+
+from nonebot_plugin_remind.codec import decode_tasks, encode_tasks
+from nonebot_plugin_remind.common import task_index, task_info
+from nonebot_plugin_remind.utils import (
+    add_task,
+    get_user_cron_tasks,
+    get_user_tasks,
+    save_tasks_to_file,
+)
+
+
+@pytest.fixture(
+    scope="module", params=STORE_SIZES, ids=lambda size: f"{size // 1000}k"
+)
+def store(request) -> list:
+    """以合成任务填充全局任务表，返回任务列表"""
+    task_info.clear()
+    task_index.clear()
+    tasks = make_tasks(request.param)
+    for task in tasks:
+        add_task(task)
+    yield tasks
+    task_info.clear()
+    task_index.clear()
+
+
+@pytest.fixture(scope="module")
+def task_file_text(store) -> str:
+    return encode_tasks(task_info)
+
+
+@pytest.fixture(scope="module")
+def jsonpickle_file_text(store) -> str:
+    """改用紧凑格式之前以 jsonpickle 保存的任务文件"""
+    return jsonpickle.encode(
+        {task.task_id: task_as_dict(task) for task in store}, indent=4
+    )
+
+
+@pytest.fixture(scope="module")
+def legacy_file_text(store) -> str:
+    return jsonpickle.encode(make_legacy_tasks(len(store)))
+
+
+def _typical_user(tasks: list) -> tuple[int, int]:
+    """返回一个普通用户及其某个群聊"""
+    task = next(t for t in tasks if t.reminder_user_id != HEAVY_USER and t.is_group)
+    return task.reminder_user_id, task.group_id
+
+
+def bench_get_user_tasks_group(benchmark, store):
+    user_id, group_id = _typical_user(store)
+    benchmark(get_user_tasks, user_id, group_id, True)
+
+
+def bench_get_user_tasks_private_all(benchmark, store):
+    """私聊中列出任务最多的用户在全部会话中的任务"""
+    result = benchmark(get_user_tasks, HEAVY_USER, None, True)
+    assert result
+
+
+def bench_get_user_tasks_unsorted(benchmark, store):
+    benchmark(get_user_tasks, HEAVY_USER, None, False)
+
+
+def bench_get_user_cron_tasks(benchmark, store):
+    result = benchmark(get_user_cron_tasks, HEAVY_USER, None)
+    assert result
+
+
+def bench_save_tasks_to_file(benchmark, store):
+    benchmark.pedantic(save_tasks_to_file, rounds=5)
+
+
+def bench_load_tasks_decode(benchmark, store, task_file_text):
+    tasks = benchmark.pedantic(decode_tasks, args=(task_file_text,), rounds=5)
+    assert len(tasks) == len(store)
+
+
+def bench_load_tasks_jsonpickle(benchmark, store, jsonpickle_file_text):
+    """改用紧凑格式之前载入任务文件的方式：jsonpickle.decode 还原整个任务表"""
+    tasks = benchmark.pedantic(
+        jsonpickle.decode, args=(jsonpickle_file_text,), rounds=3
+    )
+    assert len(tasks) == len(store)
+
+
+def bench_load_tasks_legacy_migrate(benchmark, store, legacy_file_text):
+    """旧版 jsonpickle 任务文件：整体解码后经过 migrate_all 再转换为 Task"""
+    tasks = benchmark.pedantic(decode_tasks, args=(legacy_file_text,), rounds=3)
+    assert len(tasks) == len(store)
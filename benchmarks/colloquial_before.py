@@ -0,0 +1,142 @@
+"""改用 trigger.fields 之前的循环提醒描述，作为 bench_colloquial.py 的对比基准。
+
+代码照搬自改动前的 colloquial.colloquial_crontrigger：每次调用都先将触发器转为字符串，
+再用正则表达式取出各字段。
+"""
+
+import re
+
+from apscheduler.triggers.cron import CronTrigger
+
+
+def colloquial_crontrigger(trigger: CronTrigger) -> str:
+    # 解析触发器字符串
+    trigger_str = str(trigger)
+    pattern = r"(\w+)='([^']*)'"
+    matches = re.findall(pattern, trigger_str)
+    params = {m[0]: m[1] for m in matches}
+
+    # 星期转换表
+    week_map = {
+        "6": "日",
+        "0": "一",
+        "1": "二",
+        "2": "三",
+        "3": "四",
+        "4": "五",
+        "5": "六",
+        "sun": "日",
+        "mon": "一",
+        "tue": "二",
+        "wed": "三",
+        "thu": "四",
+        "fri": "五",
+        "sat": "六",
+    }
+
+    def parse_field(field, value):
+        # 处理星期字段
+        if field == "day_of_week":
+            if "-" in value:
+                start, end = value.split("-")
+                return f"{week_map.get(start, start)}至{week_map.get(end, end)}"
+            if "," in value:
+                parts = sorted(
+                    [week_map.get(p, p) for p in value.split(",")],
+                    key=lambda x: (
+                        list(week_map.values()).index(x)
+                        if x in week_map.values()
+                        else 7
+                    ),
+                )
+                return "、".join(parts)
+            if "/" in value:
+                return f"每隔{value.split('/')[-1]}天"
+            return week_map.get(value, value)
+
+        # 处理单位映射
+        units = {"year": "年", "month": "月", "day": "日", "hour": "点", "minute": "分"}
+        unit = units[field]
+
+        # 处理间隔表达式
+        if "/" in value:
+            return f"每隔{value.split('/')[-1]}{unit}"
+
+        # 处理范围表达式
+        if "-" in value:
+            return f"{value.split('-')[0]}至{value.split('-')[1]}{unit}"
+
+        # 处理多值情况
+        if "," in value:
+            return f"{value.replace(',', '、')}{unit}"
+
+        return f"{value}{unit}"
+
+    # 构建描述组件
+    components = []
+    has_date = False
+
+    # 处理日期部分（年/月/日）
+    date_fields = []
+    for field in ["year", "month", "day"]:
+        if field in params and params[field] != "*":
+            date_fields.append(field)
+
+    # 生成日期描述
+    date_desc = []
+    for field in ["year", "month", "day"]:
+        if field not in params or params[field] == "*":
+            continue
+
+        parsed = parse_field(field, params[field])
+        if field == "year":
+            date_desc.append(f"每年{parsed.replace('年', '')}")
+        elif field == "month":
+            prefix = "年" if "year" in date_fields else "每年"
+            date_desc.append(f"{prefix}{parsed}")
+        elif field == "day":
+            prefix = "" if "month" in date_fields else "每月"
+            parsed_value = parsed.replace("日", "")
+            date_desc.append(f"{prefix}{parsed_value}日")
+
+    if date_desc:
+        components.append("".join(date_desc))
+        has_date = True
+
+    # 处理周字段
+    if "day_of_week" in params and params["day_of_week"] != "*":
+        week_desc = parse_field("day_of_week", params["day_of_week"])
+        components.append(f"每周{week_desc}")
+        has_date = True
+
+    # 处理时间部分
+    time_desc = []
+    for field in ["hour", "minute"]:
+        if field in params and params[field] != "*":
+            time_desc.append(parse_field(field, params[field]))
+
+    # 生成时间描述
+    if time_desc:
+        time_str = "".join(time_desc)
+
+        # 优化格式：仅当同时存在小时和分钟且为简单数字时显示为HH:MM
+        if len(time_desc) == 2:
+            hour_value = params.get("hour", "*")
+            minute_value = params.get("minute", "*")
+            if hour_value.isdigit() and minute_value.isdigit():
+                formatted_hour = f"{int(hour_value):02d}"
+                formatted_minute = f"{int(minute_value):02d}"
+                time_str = f"{formatted_hour}:{formatted_minute}"
+
+        # 判断是否需要时间前缀
+        if "hour" in params:
+            prefix = ""
+            if not has_date:
+                prefix = "每天"
+            time_str = f"{prefix}{time_str}"
+        elif "minute" in params:
+            time_str = f"每小时{time_str}"
+
+        components.append(time_str)
+
+    return "".join(components) if components else "每时每刻"
@@ -0,0 +1,164 @@
+"""基准测试的公共配置。
+
+插件依赖 NoneBot 配置和 localstore，在导入插件模块前先以无驱动模式初始化 NoneBot，
+数据目录放在临时目录中，不会影响本机机器人的任务文件。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import nonebot
+import pytest
+from nonebot.adapters.onebot.v11 import Adapter
+
+_store_dir = Path(tempfile.mkdtemp(prefix="remind-bench-"))
+nonebot.init(
+    driver="~none",
+    log_level="WARNING",
+    localstore_data_dir=str(_store_dir / "data"),
+    localstore_cache_dir=str(_store_dir / "cache"),
+    localstore_config_dir=str(_store_dir / "config"),
+    localstore_use_cwd=False,
+)
+nonebot.get_driver().register_adapter(Adapter)
+nonebot.load_plugin("nonebot_plugin_remind")
+
+from apscheduler.triggers.cron import CronTrigger  # noqa: E402
+from nonebot.adapters.onebot.v11 import Message, MessageSegment  # noqa: E402
+
+from nonebot_plugin_remind import __plugin_meta__  # noqa: E402
+from nonebot_plugin_remind.model import Task, TaskType  # noqa: E402
+from tests.glm_server import serve_glm  # noqa: E402
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# 合成任务库的规模
+STORE_SIZES = [1_000, 10_000, 100_000]
+# 平均每个用户的任务数
+TASKS_PER_USER = 20
+GROUP_COUNT = 50
+# 循环提醒所占比例
+CRON_RATIO = 0.2
+# 任务数最多的用户，拥有全部任务的 1%
+HEAVY_USER = 10_000
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config):
+    if not hasattr(config.option, "benchmark_storage"):
+        return
+    from pytest_benchmark.utils import get_machine_id
+
+    # 无论从哪个目录运行，基线都保存在 benchmarks/baselines 中
+    config.option.benchmark_storage = f"file://{BASELINE_DIR}"
+    # 已有相同系统和 Python 版本的基线时，自动与最新的基线比较并列出两者的耗时
+    if not config.option.benchmark_compare and any(
+        (BASELINE_DIR / get_machine_id()).glob("*.json")
+    ):
+        config.option.benchmark_compare = True
+
+
+def usage_time_expressions() -> list[str]:
+    """插件说明中列出的时间表达式"""
+    usage = __plugin_meta__.usage
+    examples = usage[usage.index("支持多种时间格式") :].splitlines()[1:]
+    return [expr for line in examples for expr in re.split(r"、", line.strip())]
+
+
+def make_tasks(count: int) -> list[Task]:
+    """生成 count 个任务，按固定随机种子生成，多次运行结果一致"""
+    rng = random.Random(count)
+    now = datetime.now().replace(second=0, microsecond=0)
+    user_count = max(count // TASKS_PER_USER, 1)
+    tasks = []
+    for i in range(count):
+        if i % 100 == 0:
+            user_id = HEAVY_USER
+        else:
+            user_id = 100_000 + rng.randrange(user_count)
+        is_group = rng.random() < 0.8
+        group_id = 900_000 + rng.randrange(GROUP_COUNT) if is_group else user_id
+        at = Message(
+            MessageSegment.at(100_000 + rng.randrange(user_count))
+            for _ in range(rng.randint(1, 3))
+        )
+        if rng.random() < CRON_RATIO:
+            task_type = TaskType.CRON
+            remind_time = CronTrigger(
+                day_of_week=rng.choice(["*", "mon-fri", "sat,sun", "wed"]),
+                hour=rng.randrange(24),
+                minute=rng.choice([0, 15, 30, 45]),
+            )
+        else:
+            task_type = TaskType.DATETIME
+            remind_time = now + timedelta(minutes=rng.randrange(1, 60 * 24 * 30))
+        tasks.append(
+            Task(
+                task_id=f"task{i:07d}",
+                reminder_user_id=user_id,
+                user_ids=at,
+                type=task_type,
+                remind_time=remind_time,
+                reminder_message=Message(f"提醒内容 {i}"),
+                is_group=is_group,
+                group_id=group_id,
+            )
+        )
+    return tasks
+
+
+def task_as_dict(task: Task) -> dict:
+    """改用 Task 之前在内存中保存任务的字典形式，字段值与 task 共用同一批对象"""
+    return {
+        "task_id": task.task_id,
+        "reminder_user_id": task.reminder_user_id,
+        "user_ids": task.user_ids,
+        "type": task.type.value,
+        "remind_time": task.remind_time,
+        "reminder_message": task.reminder_message,
+        "is_group": task.is_group,
+        "group_id": task.group_id,
+    }
+
+
+def make_legacy_tasks(count: int) -> dict[str, dict]:
+    """生成 v0.1.3 格式的旧版任务字典，解码时需要经过全部迁移步骤"""
+    rng = random.Random(count)
+    now = datetime.now().replace(second=0, microsecond=0)
+    user_count = max(count // TASKS_PER_USER, 1)
+    legacy = {}
+    for i in range(count):
+        task_id = f"task{i:07d}"
+        user_id = 100_000 + rng.randrange(user_count)
+        remind_time = now + timedelta(minutes=rng.randrange(1, 60 * 24 * 30))
+        legacy[task_id] = {
+            "task_id": task_id,
+            "reminder_user_id": str(user_id),
+            "user_ids": f"[CQ:at,qq={100_000 + rng.randrange(user_count)}] ",
+            "remind_time": remind_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "reminder_message": f"提醒内容 {i}",
+            "is_group": True,
+            "group_id": 900_000 + rng.randrange(GROUP_COUNT),
+        }
+    return legacy
+
+
+@pytest.fixture(scope="session")
+def run():
+    """在同一个事件循环中运行协程"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def glm_server(monkeypatch: pytest.MonkeyPatch):
+    """代替智谱接口的本地 HTTP 服务"""
+    with serve_glm(monkeypatch) as server:
+        yield server
@@ -1,10 +1,13 @@
-from nonebot import get_driver, on_command, on_keyword, require
+from __future__ import annotations
+
+from nonebot import get_driver, on_command, on_keyword, on_notice, require
 from nonebot.adapters.onebot.v11 import (
     Event,
     GroupMessageEvent,
     Message,
     MessageEvent,
     MessageSegment,
+    NoticeEvent,
     PrivateMessageEvent,
 )
 from nonebot.exception import FinishedException
@@ -17,25 +20,33 @@ from nonebot.typing import T_State
 
 require("nonebot_plugin_apscheduler")
 
-import os
-import random
-from datetime import datetime, timedelta
+import asyncio
 
-import jsonpickle
 from nonebot_plugin_apscheduler import scheduler
 
+from .catchup import cancel_catch_up
 from .colloquial import colloquial_time
-from .common import TASKS_FILE, task_info
+from .common import task_info, tasks_ready
 from .config import Config, remind_config
-from .data_sourse import send_reminder, set_reminder
-from .migration import migrate_all
-from .parse import extract_time_and_message, parse_time
+from .data_sourse import one_shot_dispatcher, set_reminder, unschedule_task
+from .glm4 import close_glm_client
+from .glm_cache import glm_cache
+from .list_cache import list_cache
+from .loader import load_tasks_in_background
+from .model import Task, TaskType
+from .nickname import nickname_cache
+from .parse import (
+    extract_time_and_message,
+    parse_cache_stats,
+    parse_time,
+    warm_up_jionlp,
+)
+from .storage import flush_storage, persist_task_removal
 from .utils import (
-    at_to_text,
-    format_timedelta,
     get_user_cron_tasks,
     get_user_tasks,
-    save_tasks_to_file,
+    pop_task,
+    render_task_texts,
 )
 
 __plugin_meta__ = PluginMetadata(
@@ -85,6 +96,9 @@ def private_checker():
     return Rule(_checker)
 
 
+# 任务尚未载入完成时的回复
+LOADING_MSG = "提醒任务仍在载入中，请稍后再试~"
+
 # 创建命令处理器
 remind = on_command("remind", aliases={"提醒"}, priority=5, block=True)
 remind_keyword = on_keyword({"提醒"}, rule=to_me(), priority=6, block=True)
@@ -104,31 +118,64 @@ next_remind = on_command(
     priority=5,
     block=True,
 )
+parse_cache_info = on_command(
+    "parse_cache",
+    aliases={"解析缓存"},
+    rule=private_checker(),
+    permission=SUPERUSER,
+    priority=5,
+    block=True,
+)
+
+
+# 群成员增加、减少和群名片变更（group_card 为 go-cqhttp 等实现的扩展通知）
+_MEMBER_NOTICES = {"group_increase", "group_decrease", "group_card"}
+
+
+def _member_notice(event: NoticeEvent) -> bool:
+    return event.notice_type in _MEMBER_NOTICES
+
+
+member_notice = on_notice(rule=Rule(_member_notice), priority=5, block=False)
+
+
+@member_notice.handle()
+async def _(event: NoticeEvent):
+    group_id = getattr(event, "group_id", None)
+    user_id = getattr(event, "user_id", None)
+    if group_id is not None:
+        nickname_cache.invalidate(int(group_id), int(user_id) if user_id else None)
+        list_cache.invalidate_group(int(group_id))
 
 
 @next_remind.handle()
 async def _():
     try:
-        jobs = scheduler.get_jobs()
-
-        if not jobs:
-            await next_remind.finish("已经没有定时任务啦！")
         # 过滤掉没有next_run_time的作业（例如已暂停的作业）
-        valid_jobs = [job for job in jobs if job.next_run_time is not None]
-        if not valid_jobs:
+        candidates = [
+            (job.next_run_time, job.id)
+            for job in scheduler.get_jobs()
+            if job.next_run_time is not None
+        ]
+        # 单定时器调度中的单次提醒
+        upcoming = one_shot_dispatcher.peek()
+        if upcoming is not None:
+            task_id, run_time = upcoming
+            candidates.append((run_time.astimezone(), task_id))
+        if not candidates:
             await next_remind.finish("已经没有定时任务啦！")
 
-        # 按next_run_time排序，找到最早的执行时间
-        next_job = min(valid_jobs, key=lambda job: job.next_run_time)
-        if next_job.id in task_info.keys():
-            msg = task_info[next_job.id]["reminder_message"]
+        # 按执行时间排序，找到最早的执行时间
+        next_run_time, next_id = min(candidates, key=lambda c: c[0])
+        if next_id in task_info.keys():
+            msg = task_info[next_id].reminder_message
             await next_remind.send(
-                f"下次提醒时间：\n{colloquial_time(next_job.next_run_time)}\n提醒内容：\n"
+                f"下次提醒时间：\n{colloquial_time(next_run_time)}\n提醒内容：\n"
                 + msg
             )
         else:
             await next_remind.send(
-                f"下次定时任务：\n{colloquial_time(next_job.next_run_time)}\n（不是由本插件提供的定时提醒服务）"
+                f"下次定时任务：\n{colloquial_time(next_run_time)}\n（不是由本插件提供的定时提醒服务）"
             )
     except FinishedException:
         pass
@@ -137,82 +184,51 @@ async def _():
         await next_remind.send(f"{type(e).__name__}: {e}")
 
 
-# 在机器人启动时加载任务信息
+@parse_cache_info.handle()
+async def _():
+    glm = glm_cache.stats()
+    jio = parse_cache_stats()
+    await parse_cache_info.finish(
+        f"GLM-4 解析缓存：{glm['size']}/{glm['maxsize']} 条（无法解析 {glm['negative']} 条）\n"
+        f"命中 {glm['hits']} 次，未命中 {glm['misses']} 次，命中率 {glm['hit_rate']:.1%}\n"
+        f"jionlp 解析缓存：{jio['size']}/{jio['maxsize']} 条\n"
+        f"命中 {jio['hits']} 次，未命中 {jio['misses']} 次，命中率 {jio['hit_rate']:.1%}"
+    )
+
+
+# 在机器人启动时加载任务信息，载入在后台进行，不阻塞启动
+_load_job: asyncio.Task | None = None
+
+
 @driver.on_startup
 async def load_tasks():
-    if os.path.exists(TASKS_FILE):  # noqa: ASYNC240
-        global task_info
-        with open(TASKS_FILE, encoding="utf-8") as f:  # noqa: ASYNC230
-            # 直接使用=赋值是不对的，会创建一个新的局部变量而不是修改全局变量
-            task_info.clear()
-            decoded = jsonpickle.decode(f.read())
-            if isinstance(decoded, dict):
-                task_info.update(decoded)
-        total_tasks = 0
-        expired_tasks = 0
-        current_time = datetime.now()
-        # 迁移旧版数据格式
-        if migrate_all(task_info):
-            save_tasks_to_file()
-        for task_id in task_info:
-            # 检查定时任务是否过时
-            if (
-                task_info[task_id]["type"] == "datetime"
-                and task_info[task_id]["remind_time"] <= current_time
-            ):
-                # 过时任务数+1
-                expired_tasks += 1
-                # 30秒内发完所有过时信息的提示
-                n = random.randint(10, 30)
-                delay_time = (
-                    current_time
-                    - task_info[task_id]["remind_time"]
-                    + timedelta(seconds=n)
-                )
-                task_info[task_id]["reminder_message"] += (
-                    f"\n【十分抱歉，由于账号离线，此提醒任务已超时{format_timedelta(delay_time)}。原定提醒时间为：{task_info[task_id]['remind_time'].strftime('%Y-%m-%d %H:%M')}】"
-                )
-                task_info[task_id]["remind_time"] = current_time + timedelta(seconds=n)
-            else:
-                # 如果没有过时，总任务数+1
-                total_tasks += 1
-            # 恢复定时任务
-            if task_info[task_id]["type"] == "datetime":
-                scheduler.add_job(
-                    send_reminder,
-                    "date",
-                    run_date=task_info[task_id]["remind_time"],
-                    args=[
-                        task_id,
-                        task_info[task_id]["user_ids"],
-                        task_info[task_id]["reminder_message"],
-                        task_info[task_id]["is_group"],
-                        task_info[task_id]["group_id"],
-                    ],
-                    id=task_id,
-                )
-            else:
-                scheduler.add_job(
-                    send_reminder,
-                    trigger=task_info[task_id]["remind_time"],
-                    args=[
-                        task_id,
-                        task_info[task_id]["user_ids"],
-                        task_info[task_id]["reminder_message"],
-                        task_info[task_id]["is_group"],
-                        task_info[task_id]["group_id"],
-                    ],
-                    id=task_id,
-                )
-
-        # 输出信息
-        if expired_tasks:
-            info = f"已载入 {total_tasks} 个任务，删除 {expired_tasks} 个过时任务"
-            logger.warning(info)
-        else:
-            info = f"全部 {total_tasks} 个定时任务均已载入完成！"
-            logger.success(info)
-        save_tasks_to_file()
+    global _load_job
+    _load_job = asyncio.create_task(load_tasks_in_background())
+
+
+# 启动后在后台线程中预加载 jionlp，避免第一个设置提醒的用户等待导入
+_warm_up_job: asyncio.Task | None = None
+
+
+@driver.on_startup
+async def warm_up_parser():
+    global _warm_up_job
+    _warm_up_job = asyncio.create_task(_warm_up_in_background())
+
+
+async def _warm_up_in_background():
+    try:
+        await asyncio.to_thread(warm_up_jionlp)
+    except Exception as e:
+        # 预加载失败不影响使用，第一次解析时会再次导入
+        logger.opt(exception=e).error(f"预加载 jionlp 失败: {e}")
+
+
+# 在机器人关闭时保存尚未落盘的任务变更
+@driver.on_shutdown
+async def flush_tasks():
+    await flush_storage()
+    close_glm_client()
 
 
 # ── 辅助函数 ────────────────────────────────────────────────
@@ -273,35 +289,40 @@ def _parse_task_indexes(
 
 async def _delete_tasks(
     matcher,  # type: ignore[no-untyped-def]
-    user_tasks: list[dict],
+    user_tasks: list[Task],
     indexes: list[int],
     *,
     label: str = "提醒",
 ) -> None:
     """按索引删除任务列表中的任务并发送结果消息。"""
-    msg_list = []
-    for index in indexes:
-        if index < 0 or index >= len(user_tasks):
-            raise ValueError("任务ID超出范围")
-        tid = user_tasks[index]["task_id"]
-        str_msg = str(user_tasks[index]["reminder_message"])
-        group_id_temp = user_tasks[index]["group_id"] if user_tasks[index]["is_group"] else None
-        job = scheduler.get_job(tid)
-        if job:
-            job.remove()
-            info = str_msg if len(str_msg) <= 20 else str_msg[:20] + "..."
-            logger.success(f"成功删除{label}[{tid}]:{info!r}")
-            del task_info[tid]
-            display = await at_to_text(group_id_temp, user_tasks[index]["user_ids"]) + str_msg
-            msg_list.append(f"{index + 1:02d}  {display}")
-        else:
-            raise RuntimeError(f"任务{index + 1:02d}不存在或已被删除。")
+    deleted = []
+    try:
+        for index in indexes:
+            if index < 0 or index >= len(user_tasks):
+                raise ValueError("任务ID超出范围")
+            task = user_tasks[index]
+            tid = task.task_id
+            str_msg = str(task.reminder_message)
+            if unschedule_task(tid) or cancel_catch_up(tid):
+                info = str_msg if len(str_msg) <= 20 else str_msg[:20] + "..."
+                logger.success(f"成功删除{label}[{tid}]:{info!r}")
+                pop_task(tid)
+                deleted.append(index)
+            else:
+                raise RuntimeError(f"任务{index + 1:02d}不存在或已被删除。")
+    finally:
+        # 后面的索引出错时，前面已从内存中删除的任务也要持久化
+        if deleted:
+            persist_task_removal(*(user_tasks[index].task_id for index in deleted))
+    displays = await render_task_texts([user_tasks[index] for index in deleted])
+    msg_list = [
+        f"{index + 1:02d}  {display}" for index, display in zip(deleted, displays)
+    ]
     msgs = "\n\n".join(msg_list)
     try:
         await matcher.send(Message(f"成功删除以下{label}任务！\n" + msgs))
     except Exception:
         await matcher.send(f"成功删除以下{label}任务！(raw)\n" + msgs)
-    save_tasks_to_file()
 
 
 # ── /remind 命令交互 ─────────────────────────────────────────
@@ -478,7 +499,9 @@ async def set_reminder_keyword(event: Event, state: T_State):
 
 @del_remind.handle()
 async def del_remind_handler(event: Event, args: Message = CommandArg()):
-    reminder_user_id = event.get_user_id()
+    if not tasks_ready():
+        await del_remind.finish(LOADING_MSG)
+    reminder_user_id = int(event.get_user_id())
     group_id = event.group_id if isinstance(event, GroupMessageEvent) else None
     raw = args.extract_plain_text().strip()
     if not raw:
@@ -500,27 +523,35 @@ async def del_remind_handler(event: Event, args: Message = CommandArg()):
         await del_remind.send(f"运行时错误：{e}")
 
 
+async def _render_reminds(user_id: int, group_id: int | None, sort: bool) -> str:
+    """渲染单次提醒列表，没有任务时返回空字符串"""
+    user_tasks = get_user_tasks(user_id, group_id, sort)
+    displays = await render_task_texts(user_tasks)
+    msg_list = []
+    for index, (task, display) in enumerate(zip(user_tasks, displays), start=1):
+        remind_time = task.remind_time.strftime("%Y/%m/%d %H:%M")
+        msg = f"{index:02d} 时间: {remind_time}, 内容: "
+        msg_list.append(msg + display)
+    return "\n\n".join(msg_list)
+
+
 # 列出用户的提醒任务
 @list_reminds.handle()
 async def list_reminds_handler(event: Event, args: Message = CommandArg()):
-    reminder_user_id = event.get_user_id()
+    if not tasks_ready():
+        await list_reminds.finish(LOADING_MSG)
+    reminder_user_id = int(event.get_user_id())
     group_id = event.group_id if isinstance(event, GroupMessageEvent) else None
     # 可选参数"-s"，表示使用设置时间顺序输出。否则默认用提醒时间顺序输出
     arg = args.extract_plain_text().lower().strip()
-    user_tasks = get_user_tasks(reminder_user_id, group_id, arg != "-s")
-
-    if user_tasks:
-        msg_list = []
-        for index, task in enumerate(user_tasks, start=1):
-            remind_time = task["remind_time"].strftime("%Y/%m/%d %H:%M")
-            msg = f"{index:02d} 时间: {remind_time}, 内容: "
-            user_ids = task["user_ids"]
-            reminder_message = str(task["reminder_message"])
-            # 将其中的at改为纯文本，避免打扰别人
-            group_id_temp = task["group_id"] if task["is_group"] else None
-            msg += await at_to_text(group_id_temp, user_ids) + reminder_message
-            msg_list.append(msg)
-        msgs = "\n\n".join(msg_list)
+    sort = arg != "-s"
+    msgs = await list_cache.get(
+        reminder_user_id,
+        (TaskType.DATETIME, group_id, sort),
+        lambda: _render_reminds(reminder_user_id, group_id, sort),
+    )
+
+    if msgs:
         try:
             await list_reminds.send(Message("您的提醒任务列表:\n" + msgs))
         except Exception:
@@ -531,7 +562,9 @@ async def list_reminds_handler(event: Event, args: Message = CommandArg()):
 
 @del_cron_remind.handle()
 async def del_cron_remind_handler(event: Event, args: Message = CommandArg()):
-    reminder_user_id = event.get_user_id()
+    if not tasks_ready():
+        await del_cron_remind.finish(LOADING_MSG)
+    reminder_user_id = int(event.get_user_id())
     group_id = event.group_id if isinstance(event, GroupMessageEvent) else None
     raw = args.extract_plain_text().strip()
     if not raw:
@@ -553,25 +586,32 @@ async def del_cron_remind_handler(event: Event, args: Message = CommandArg()):
         await del_cron_remind.send(f"运行时错误：{e}")
 
 
+async def _render_cron_reminds(user_id: int, group_id: int | None) -> str:
+    """渲染循环提醒列表，没有任务时返回空字符串"""
+    user_tasks = get_user_cron_tasks(user_id, group_id)
+    displays = await render_task_texts(user_tasks)
+    msg_list = []
+    for index, (task, display) in enumerate(zip(user_tasks, displays), start=1):
+        remind_time = task.remind_time
+        msg = f"{index:02d} 时间: {colloquial_time(remind_time)}, 内容: "
+        msg_list.append(msg + display)
+    return "\n\n".join(msg_list)
+
+
 # 列出用户的循环提醒任务
 @list_cron_reminds.handle()
 async def list_cron_reminds_handler(event: Event):
-    reminder_user_id = event.get_user_id()
+    if not tasks_ready():
+        await list_cron_reminds.finish(LOADING_MSG)
+    reminder_user_id = int(event.get_user_id())
     group_id = event.group_id if isinstance(event, GroupMessageEvent) else None
-    user_tasks = get_user_cron_tasks(reminder_user_id, group_id)
-
-    if user_tasks:
-        msg_list = []
-        for index, task in enumerate(user_tasks, start=1):
-            remind_time = task["remind_time"]
-            msg = f"{index:02d} 时间: {colloquial_time(remind_time)}, 内容: "
-            user_ids = task["user_ids"]
-            reminder_message = str(task["reminder_message"])
-            # 将其中的at改为纯文本，避免打扰别人
-            group_id_temp = task["group_id"] if task["is_group"] else None
-            msg += await at_to_text(group_id_temp, user_ids) + reminder_message
-            msg_list.append(msg)
-        msgs = "\n\n".join(msg_list)
+    msgs = await list_cache.get(
+        reminder_user_id,
+        (TaskType.CRON, group_id, False),
+        lambda: _render_cron_reminds(reminder_user_id, group_id),
+    )
+
+    if msgs:
         try:
             await list_cron_reminds.send(Message("您的循环提醒任务列表:\n" + msgs))
         except Exception:
@@ -0,0 +1,100 @@
+"""群提醒合并发送模块。
+
+remind_merge_window 大于 0 时，同一群在窗口期内到期的提醒会合并成一条消息发送：
+被 at 的人去重后放在开头，各条提醒内容依次换行排列，只调用一次发送接口。
+合并消息发送失败时由批次统一发送一条附带错误信息的消息，发送超时则不再重发。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable
+from typing import Callable
+
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+from nonebot.log import logger
+
+from .ratelimit import SendTimeoutError
+
+
+class _Batch:
+    __slots__ = ("items", "future")
+
+    def __init__(self, future: asyncio.Future):
+        self.items: list[tuple[Message, Message]] = []
+        self.future = future
+
+
+def merge_reminders(items: list[tuple[Message, Message]]) -> Message:
+    """合并多条提醒为一条消息，items 为 (被提醒人, 提醒内容) 列表"""
+    if len(items) == 1:
+        user_ids, reminder_message = items[0]
+        return user_ids + reminder_message
+    mentions = Message()
+    seen = set()
+    for user_ids, _ in items:
+        for seg in user_ids:
+            if seg.type != "at":
+                continue
+            qq = str(seg.data.get("qq"))
+            if qq not in seen:
+                seen.add(qq)
+                mentions.append(MessageSegment.at(qq))
+    message = mentions
+    for _, reminder_message in items:
+        if message:
+            message += MessageSegment.text("\n")
+        message += reminder_message
+    return message
+
+
+class GroupReminderBatcher:
+    def __init__(
+        self,
+        send: Callable[[int, Message], Awaitable[None]],
+        window: Callable[[], float],
+    ):
+        self._send = send
+        self._window = window
+        self._pending: dict[int, _Batch] = {}
+        self._sending: set[asyncio.Task] = set()
+
+    async def submit(self, group_id: int, user_ids: Message, message: Message):
+        """加入群 group_id 的待发送批次，在批次发送完成后返回
+
+        合并后的消息发送失败时批次只发送一条附带错误信息的消息，
+        这条消息也发送失败时，批次内每个调用者都会收到该异常。
+        """
+        batch = self._pending.get(group_id)
+        if batch is None:
+            batch = _Batch(asyncio.get_running_loop().create_future())
+            self._pending[group_id] = batch
+            asyncio.get_running_loop().call_later(
+                self._window(), self._flush, group_id, batch
+            )
+        batch.items.append((user_ids, message))
+        await asyncio.shield(batch.future)
+
+    def _flush(self, group_id: int, batch: _Batch):
+        if self._pending.get(group_id) is batch:
+            del self._pending[group_id]
+        task = asyncio.ensure_future(self._send_batch(group_id, batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send_batch(self, group_id: int, batch: _Batch):
+        try:
+            await self._send(group_id, merge_reminders(batch.items))
+        except SendTimeoutError as e:
+            logger.warning(f"群{group_id}的 {len(batch.items)} 条提醒{e}，不再重发")
+        except Exception as e:
+            error = (Message(), Message(MessageSegment.text(f"{type(e).__name__}: {e}")))
+            try:
+                await self._send(group_id, merge_reminders([error, *batch.items]))
+            except Exception as fallback_error:
+                batch.future.set_exception(fallback_error)
+                return
+        else:
+            if len(batch.items) > 1:
+                logger.info(f"已将群{group_id}的 {len(batch.items)} 条提醒合并为一条消息发送")
+        batch.future.set_result(None)
@@ -0,0 +1,51 @@
+"""熔断器模块。
+
+连续失败达到阈值后熔断，冷却期内的调用直接被拒绝；
+冷却期过后放行一个试探调用，成功则恢复，失败则重新熔断。
+"""
+
+from __future__ import annotations
+
+import time
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        """threshold 为触发熔断的连续失败次数，不大于 0 时不熔断"""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self._opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """是否放行本次调用，半开状态下同一时间只放行一个试探调用"""
+        if self._opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._probing or (0 < self.threshold <= self._failures):
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self):
+        """放行的调用未能得出结果（如排队超时）时归还试探机会"""
+        self._probing = False
@@ -0,0 +1,146 @@
+"""启动时过时提醒的补发模块。
+
+账号离线期间到期的单次提醒不再各自定时，而是按原定提醒时间先后排队，
+以 remind_catchup_rate 的速率逐条补发，避免重启后短时间内发出大量消息。
+超过 remind_catchup_max_age 小时的提醒按 remind_catchup_stale_action 丢弃或按会话汇总为一条消息。
+补发时在消息副本后附上致歉说明，任务本身的提醒内容不会被修改。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+from nonebot.log import logger
+
+from .batcher import merge_reminders
+from .common import task_info
+from .config import remind_config
+from .data_sourse import send_reminder
+from .model import Task
+from .ratelimit import TokenBucket
+from .storage import persist_task_removal
+from .utils import format_timedelta, pop_task
+
+# 两次进度日志的最短间隔秒数
+_PROGRESS_INTERVAL = 30.0
+
+_catch_up_job: asyncio.Task | None = None
+# 尚未补发的任务ID
+_pending: set[str] = set()
+
+
+def _apology(task: Task, now: datetime) -> str:
+    delay_time = now - task.remind_time
+    return f"\n【十分抱歉，由于账号离线，此提醒任务已超时{format_timedelta(delay_time)}。原定提醒时间为：{task.remind_time.strftime('%Y-%m-%d %H:%M')}】"
+
+
+def _split_stale(tasks: list[Task], now: datetime) -> tuple[list[Task], list[Task]]:
+    """按 remind_catchup_max_age 分出 (逐条补发, 过于陈旧) 两组任务"""
+    max_age = remind_config.remind_catchup_max_age
+    if max_age <= 0:
+        return tasks, []
+    cutoff = now - timedelta(hours=max_age)
+    fresh = [task for task in tasks if task.remind_time >= cutoff]
+    stale = [task for task in tasks if task.remind_time < cutoff]
+    return fresh, stale
+
+
+def _summarize(tasks: list[Task]) -> dict[tuple[bool, int], Message]:
+    """把陈旧提醒按会话汇总，返回 {(是否群聊, 群号或用户id): 汇总消息}"""
+    chats: dict[tuple[bool, int], list[tuple[Message, Message]]] = {}
+    for task in tasks:
+        line = Message(
+            MessageSegment.text(f"[{task.remind_time.strftime('%Y-%m-%d %H:%M')}] ")
+        )
+        line += task.reminder_message
+        user_ids = task.user_ids if task.is_group else Message()
+        chats.setdefault((task.is_group, task.group_id), []).append((user_ids, line))
+    summaries = {}
+    for chat, items in chats.items():
+        head = Message(
+            f"【十分抱歉，由于账号离线，以下 {len(items)} 条提醒已超时】"
+        )
+        # 被@的人去重后放在开头，其后是说明和各条提醒
+        summaries[chat] = merge_reminders([(Message(), head), *items])
+    return summaries
+
+
+def _discard(tasks: list[Task]):
+    _pending.difference_update(task.task_id for task in tasks)
+    removed = [task.task_id for task in tasks if pop_task(task.task_id) is not None]
+    if removed:
+        persist_task_removal(*removed)
+
+
+async def _replay(tasks: list[Task]):
+    now = datetime.now()
+    tasks.sort(key=lambda task: task.remind_time)
+    fresh, stale = _split_stale(tasks, now)
+
+    bucket = TokenBucket(remind_config.remind_catchup_rate, 1)
+    if stale:
+        if remind_config.remind_catchup_stale_action == "summary":
+            summaries = _summarize(stale)
+            _discard(stale)
+            for (is_group, chat_id), message in summaries.items():
+                await bucket.acquire()
+                try:
+                    await send_reminder("", Message(), message, is_group, chat_id)
+                except Exception as e:
+                    logger.opt(exception=e).error(f"补发过时提醒汇总失败: {e}")
+            logger.warning(
+                f"已将 {len(stale)} 个超过 {remind_config.remind_catchup_max_age} 小时的过时提醒汇总为 {len(summaries)} 条消息"
+            )
+        else:
+            _discard(stale)
+            logger.warning(
+                f"已丢弃 {len(stale)} 个超过 {remind_config.remind_catchup_max_age} 小时的过时提醒"
+            )
+
+    total = len(fresh)
+    sent = skipped = 0
+    last_report = time.monotonic()
+    for task in fresh:
+        if task.task_id in _pending:
+            await bucket.acquire()
+        # 补发期间已被用户删除
+        if task.task_id not in _pending or task.task_id not in task_info:
+            skipped += 1
+            continue
+        _pending.discard(task.task_id)
+        message = task.reminder_message + _apology(task, datetime.now())
+        try:
+            await send_reminder(
+                task.task_id, task.user_ids, message, task.is_group, task.group_id
+            )
+        except Exception as e:
+            logger.opt(exception=e).error(f"补发提醒[{task.task_id}]失败: {e}")
+        sent += 1
+        if time.monotonic() - last_report >= _PROGRESS_INTERVAL:
+            last_report = time.monotonic()
+            logger.info(f"过时提醒补发进度：{sent + skipped}/{total}")
+    if total:
+        logger.success(f"过时提醒补发完成：发送 {sent} 个，跳过已删除的 {skipped} 个")
+
+
+def start_catch_up(tasks: list[Task]):
+    """在后台按原定提醒时间顺序补发过时提醒"""
+    global _catch_up_job
+    if not tasks:
+        return
+    _pending.update(task.task_id for task in tasks)
+    logger.info(
+        f"开始补发 {len(tasks)} 个过时提醒，速率 {remind_config.remind_catchup_rate} 个/秒"
+    )
+    _catch_up_job = asyncio.create_task(_replay(tasks))
+
+
+def cancel_catch_up(task_id: str) -> bool:
+    """取消尚未补发的过时提醒，返回该提醒是否在补发队列中"""
+    if task_id in _pending:
+        _pending.discard(task_id)
+        return True
+    return False
@@ -0,0 +1,164 @@
+"""任务数据的紧凑序列化格式。
+
+任务文件格式（version 2）:
+    {"version": 2, "tasks": [<task>, ...]}
+
+单个任务:
+    {
+        "v": 2,
+        "id": "任务ID",
+        "uid": "提醒人id",
+        "at": [{"type": "at", "data": {"qq": 123}}],  # OneBot 消息段数组
+        "kind": "d" | "c",                            # 单次 / 循环
+        "time": 1767225600 | {"fields": {"hour": "8", "minute": "0"}, "tz": "Asia/Shanghai"},
+        "msg": [{"type": "text", "data": {"text": "..."}}],
+        "grp": true,
+        "gid": 123456
+    }
+
+循环提醒设置了起止时间或随机延迟时，"time" 中另有 "start"、"end"（ISO 格式）和 "jitter"。
+
+旧版 jsonpickle 格式仍可读取，写入时统一使用新格式。
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+import jsonpickle
+from apscheduler.triggers.cron import CronTrigger
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+from nonebot.log import logger
+
+from .migration import migrate_all, migrate_task
+from .model import Task, TaskType
+
+FORMAT_VERSION = 2
+
+# 循环提醒中字段之外的触发器参数：(保存的键, CronTrigger 参数名)
+_CRON_EXTRAS = (("start", "start_date"), ("end", "end_date"), ("jitter", "jitter"))
+
+
+def _encode_message(message: Message) -> list:
+    return [{"type": seg.type, "data": seg.data} for seg in message]
+
+
+def _decode_message(segments: list) -> Message:
+    return Message([MessageSegment(seg["type"], seg["data"]) for seg in segments])
+
+
+def _encode_cron(trigger: CronTrigger) -> dict:
+    fields = {f.name: str(f) for f in trigger.fields if not f.is_default}
+    data = {"fields": fields, "tz": str(trigger.timezone)}
+    if trigger.start_date is not None:
+        data["start"] = trigger.start_date.isoformat()
+    if trigger.end_date is not None:
+        data["end"] = trigger.end_date.isoformat()
+    if trigger.jitter is not None:
+        data["jitter"] = trigger.jitter
+    return data
+
+
+def _decode_cron(data: dict) -> CronTrigger:
+    kwargs = dict(data["fields"])
+    for key, name in _CRON_EXTRAS:
+        if key in data:
+            kwargs[name] = data[key]
+    try:
+        return CronTrigger(timezone=data["tz"], **kwargs)
+    except Exception as e:
+        logger.warning(f"无法还原时区 {data.get('tz')!r}，使用本地时区: {e}")
+        return CronTrigger(**kwargs)
+
+
+def encode_task(task: Task) -> dict:
+    """将单个任务编码为仅含基础类型的字典"""
+    if task.type is TaskType.DATETIME:
+        kind = "d"
+        time = int(task.remind_time.timestamp())
+    else:
+        kind = "c"
+        time = _encode_cron(task.remind_time)
+    return {
+        "v": FORMAT_VERSION,
+        "id": task.task_id,
+        "uid": task.reminder_user_id,
+        "at": _encode_message(task.user_ids),
+        "kind": kind,
+        "time": time,
+        "msg": _encode_message(task.reminder_message),
+        "grp": task.is_group,
+        "gid": task.group_id,
+    }
+
+
+def decode_task(data: dict) -> Task:
+    """解码单个任务，兼容旧版 jsonpickle 格式的任务字典"""
+    if data.get("v") != FORMAT_VERSION:
+        legacy = jsonpickle.Unpickler().restore(data)
+        migrate_task(legacy["task_id"], legacy)
+        return Task.from_dict(legacy)
+    if data["kind"] == "d":
+        task_type = TaskType.DATETIME
+        remind_time = datetime.fromtimestamp(data["time"])
+    else:
+        task_type = TaskType.CRON
+        remind_time = _decode_cron(data["time"])
+    return Task(
+        task_id=data["id"],
+        reminder_user_id=int(data["uid"]),
+        user_ids=_decode_message(data["at"]),
+        type=task_type,
+        remind_time=remind_time,
+        reminder_message=_decode_message(data["msg"]),
+        is_group=data["grp"],
+        group_id=data["gid"],
+    )
+
+
+def encode_tasks(tasks: dict) -> str:
+    """将全部任务编码为任务文件内容"""
+    return json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "tasks": [encode_task(task) for task in tasks.values()],
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def iter_task_batches(text: str, batch_size: int) -> Iterator[list[Task]]:
+    """分批解码任务文件内容，同时支持新格式和旧版 jsonpickle 格式
+
+    旧版数据会先经过 migration 迁移再转换为 Task。
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        return
+    if data.get("version") == FORMAT_VERSION and isinstance(data.get("tasks"), list):
+        items = data["tasks"]
+        for start in range(0, len(items), batch_size):
+            yield [decode_task(item) for item in items[start : start + batch_size]]
+        return
+    # 旧版：以任务ID为键、jsonpickle 编码的任务字典，只能整体解码
+    decoded = jsonpickle.Unpickler().restore(data)
+    if not isinstance(decoded, dict):
+        return
+    for task_id, legacy in decoded.items():
+        legacy.setdefault("task_id", task_id)
+    migrate_all(decoded)
+    tasks = [Task.from_dict(legacy) for legacy in decoded.values()]
+    for start in range(0, len(tasks), batch_size):
+        yield tasks[start : start + batch_size]
+
+
+def decode_tasks(text: str) -> dict:
+    """解码任务文件内容，返回以任务ID为键的字典"""
+    return {
+        task.task_id: task
+        for batch in iter_task_batches(text, 1000)
+        for task in batch
+    }
@@ -1,7 +1,11 @@
-import re
+from __future__ import annotations
+
 from datetime import datetime
+
 from apscheduler.triggers.cron import CronTrigger
 
+from .lru import LRUCache
+
 
 def colloquial_time(remind_time: datetime | CronTrigger) -> str:
     """
@@ -83,69 +87,78 @@ def colloquial_datetime(remind_time: datetime) -> str:
     return res
 
 
+# 星期转换表
+_WEEK_MAP = {
+    "6": "日",
+    "0": "一",
+    "1": "二",
+    "2": "三",
+    "3": "四",
+    "4": "五",
+    "5": "六",
+    "sun": "日",
+    "mon": "一",
+    "tue": "二",
+    "wed": "三",
+    "thu": "四",
+    "fri": "五",
+    "sat": "六",
+}
+# 多个星期的排列顺序，从星期日开始
+_WEEK_ORDER = {name: i for i, name in enumerate("日一二三四五六")}
+_UNITS = {"year": "年", "month": "月", "day": "日", "hour": "点", "minute": "分"}
+
+# 相同的循环时间描述只生成一次，键为非默认字段的 (名称, 表达式)
+_cron_desc_cache: LRUCache[tuple[tuple[str, str], ...], str] = LRUCache(512)
+
+
 def colloquial_crontrigger(trigger: CronTrigger) -> str:
-    # 解析触发器字符串
-    trigger_str = str(trigger)
-    pattern = r"(\w+)='([^']*)'"
-    matches = re.findall(pattern, trigger_str)
-    params = {m[0]: m[1] for m in matches}
-
-    # 星期转换表
-    week_map = {
-        "6": "日",
-        "0": "一",
-        "1": "二",
-        "2": "三",
-        "3": "四",
-        "4": "五",
-        "5": "六",
-        "sun": "日",
-        "mon": "一",
-        "tue": "二",
-        "wed": "三",
-        "thu": "四",
-        "fri": "五",
-        "sat": "六",
-    }
-
-    def parse_field(field, value):
-        # 处理星期字段
-        if field == "day_of_week":
-            if "-" in value:
-                start, end = value.split("-")
-                return f"{week_map.get(start, start)}至{week_map.get(end, end)}"
-            if "," in value:
-                parts = sorted(
-                    [week_map.get(p, p) for p in value.split(",")],
-                    key=lambda x: (
-                        list(week_map.values()).index(x)
-                        if x in week_map.values()
-                        else 7
-                    ),
-                )
-                return "、".join(parts)
-            if "/" in value:
-                return f"每隔{value.split('/')[-1]}天"
-            return week_map.get(value, value)
-
-        # 处理单位映射
-        units = {"year": "年", "month": "月", "day": "日", "hour": "点", "minute": "分"}
-        unit = units[field]
-
-        # 处理间隔表达式
+    """将CronTrigger转换成口语化的时间表达"""
+    signature = tuple(
+        (field.name, str(field)) for field in trigger.fields if not field.is_default
+    )
+    desc = _cron_desc_cache.get(signature)
+    if desc is None:
+        desc = _describe_cron(dict(signature))
+        _cron_desc_cache.put(signature, desc)
+    return desc
+
+
+def _parse_field(field: str, value: str) -> str:
+    # 处理星期字段
+    if field == "day_of_week":
+        if "-" in value:
+            start, end = value.split("-")
+            return f"{_WEEK_MAP.get(start, start)}至{_WEEK_MAP.get(end, end)}"
+        if "," in value:
+            parts = sorted(
+                (_WEEK_MAP.get(p, p) for p in value.split(",")),
+                key=lambda x: _WEEK_ORDER.get(x, 7),
+            )
+            return "、".join(parts)
         if "/" in value:
-            return f"每隔{value.split('/')[-1]}{unit}"
+            return f"每隔{value.split('/')[-1]}天"
+        return _WEEK_MAP.get(value, value)
 
-        # 处理范围表达式
-        if "-" in value:
-            return f"{value.split('-')[0]}至{value.split('-')[1]}{unit}"
+    unit = _UNITS[field]
 
-        # 处理多值情况
-        if "," in value:
-            return f"{value.replace(',', '、')}{unit}"
+    # 处理间隔表达式
+    if "/" in value:
+        return f"每隔{value.split('/')[-1]}{unit}"
+
+    # 处理范围表达式
+    if "-" in value:
+        return f"{value.split('-')[0]}至{value.split('-')[1]}{unit}"
+
+    # 处理多值情况
+    if "," in value:
+        return f"{value.replace(',', '、')}{unit}"
+
+    return f"{value}{unit}"
 
-        return f"{value}{unit}"
 
+def _describe_cron(params: dict[str, str]) -> str:
+    """根据非默认字段的表达式生成描述"""
     # 构建描述组件
     components = []
     has_date = False
@@ -162,7 +175,7 @@ def colloquial_crontrigger(trigger: CronTrigger) -> str:
         if field not in params or params[field] == "*":
             continue
 
-        parsed = parse_field(field, params[field])
+        parsed = _parse_field(field, params[field])
         if field == "year":
             date_desc.append(f"每年{parsed.replace('年', '')}")
         elif field == "month":
@@ -179,7 +192,7 @@ def colloquial_crontrigger(trigger: CronTrigger) -> str:
 
     # 处理周字段
     if "day_of_week" in params and params["day_of_week"] != "*":
-        week_desc = parse_field("day_of_week", params["day_of_week"])
+        week_desc = _parse_field("day_of_week", params["day_of_week"])
         components.append(f"每周{week_desc}")
         has_date = True
 
@@ -187,7 +200,7 @@ def colloquial_crontrigger(trigger: CronTrigger) -> str:
     time_desc = []
     for field in ["hour", "minute"]:
         if field in params and params[field] != "*":
-            time_desc.append(parse_field(field, params[field]))
+            time_desc.append(_parse_field(field, params[field]))
 
     # 生成时间描述
     if time_desc:
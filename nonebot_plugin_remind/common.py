@@ -5,8 +5,27 @@ require("nonebot_plugin_localstore")
 
 import nonebot_plugin_localstore as store
 
+from .index import TaskIndex
+
 
 TASKS_FILE: Path = store.get_plugin_data_file("remind_tasks.json")
+JOURNAL_FILE: Path = store.get_plugin_data_file("remind_tasks.journal")
+DB_FILE: Path = store.get_plugin_data_file("remind_tasks.db")
+GLM_CACHE_FILE: Path = store.get_plugin_cache_file("glm_cache.json")
 
 # 存储任务信息的字典
 task_info = {}
+# task_info 的二级索引，随 task_info 一同增删
+task_index = TaskIndex()
+
+# 启动时的任务载入是否已完成，完成前 task_info 中的任务并不完整
+_tasks_ready = False
+
+
+def tasks_ready() -> bool:
+    return _tasks_ready
+
+
+def set_tasks_ready():
+    global _tasks_ready
+    _tasks_ready = True
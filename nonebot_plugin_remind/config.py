@@ -1,3 +1,5 @@
+from typing import Literal
+
 from nonebot import get_driver, get_plugin_config
 from pydantic import BaseModel, Field
 
@@ -23,6 +25,128 @@ class Config(BaseModel):
         default="",
         description="GLM-4 系列大模型的 API_KEY",
     )
+    remind_fast_parse: bool = Field(
+        default=True,
+        description="是否先用内置规则快速解析常见的单次时间表达式，无法解析时再交给 jionlp",
+    )
+    remind_parse_cache_size: int = Field(
+        default=256,
+        description="jionlp 时间解析结果的缓存条数，0 表示不缓存",
+    )
+    remind_nickname_ttl: float = Field(
+        default=600,
+        description="群成员昵称缓存的有效秒数",
+    )
+    remind_nickname_cache_groups: int = Field(
+        default=64,
+        description="最多缓存多少个群的成员昵称，超出时淘汰最久未使用的群",
+    )
+    remind_nickname_lookup: Literal["list", "info"] = Field(
+        default="list",
+        description="昵称查询方式：list 获取并缓存整个群成员列表，info 逐个查询并缓存单个成员",
+    )
+    remind_list_cache_size: int = Field(
+        default=256,
+        description="最多缓存多少个用户的提醒列表渲染结果，0 表示不缓存",
+    )
+    glm_completion_mode: Literal["async", "sync", "stream"] = Field(
+        default="async",
+        description="GLM-4 调用方式：async 提交异步任务后轮询结果，sync 同步接口，stream 流式接口",
+    )
+    glm_timeout: float = Field(
+        default=15,
+        description="单次 GLM-4 解析的超时秒数（含排队、等待合并和逐条重新解析的时间）",
+    )
+    glm_concurrency: int = Field(
+        default=2,
+        description="同时进行的 GLM-4 请求数上限",
+    )
+    glm_batch_window: float = Field(
+        default=0.2,
+        description="已有 GLM-4 解析请求进行时，在多少秒内到达的请求合并为一次调用，0 表示不合并",
+    )
+    glm_batch_size: int = Field(
+        default=10,
+        description="一次合并调用最多包含的解析请求数",
+    )
+    glm_breaker_threshold: int = Field(
+        default=3,
+        description="GLM-4 连续失败或超时多少次后暂停调用，0 表示不暂停",
+    )
+    glm_breaker_cooldown: float = Field(
+        default=60,
+        description="GLM-4 暂停调用的秒数，之后放行一次试探请求",
+    )
+    glm_cache_size: int = Field(
+        default=1000,
+        description="GLM-4 解析结果的缓存条数，0 表示不缓存",
+    )
+    glm_cache_negative_ttl: float = Field(
+        default=3600,
+        description="GLM-4 无法解析的结果的缓存秒数",
+    )
+    remind_storage: Literal["json", "journal", "sqlite"] = Field(
+        default="json",
+        description="任务持久化方式：json 每次变更重写整个文件，journal 追加写入变更日志并定期压缩，sqlite 使用带索引的 SQLite 数据库",
+    )
+    remind_save_delay: float = Field(
+        default=1.0,
+        description="json 模式下合并写入的等待秒数，期间的所有变更只写入一次；不大于 0 时每次变更立即写入",
+    )
+    remind_dispatcher: Literal["apscheduler", "timer"] = Field(
+        default="apscheduler",
+        description="单次提醒的调度方式：apscheduler 每个提醒一个任务，timer 全部单次提醒共用一个定时器",
+    )
+    remind_merge_window: float = Field(
+        default=0,
+        description="同一群在多少秒内到期的提醒合并为一条消息发送，0 表示不合并",
+    )
+    remind_send_rate: float = Field(
+        default=10.0,
+        description=(
+            "全部提醒每秒最多发送的消息数，不大于 0 时不限速；"
+            "同时到期的 N 条提醒约需 (N - 突发数) / 速率 秒才能发完，调低更不易被风控但提醒会延后"
+        ),
+    )
+    remind_send_burst: int = Field(
+        default=20,
+        description="全部提醒允许连续突发发送的消息数",
+    )
+    remind_chat_send_rate: float = Field(
+        default=2.0,
+        description=(
+            "同一群聊或私聊每秒最多发送的提醒消息数，不大于 0 时不限速；"
+            "同一群同时到期的提醒较多时可配合 remind_merge_window 合并发送"
+        ),
+    )
+    remind_chat_send_burst: int = Field(
+        default=5,
+        description="同一群聊或私聊允许连续突发发送的提醒消息数",
+    )
+    remind_send_concurrency: int = Field(
+        default=4,
+        description="同时进行中的提醒发送接口调用数上限",
+    )
+    remind_send_timeout: float = Field(
+        default=30,
+        description="单次提醒发送接口调用的超时秒数，不大于 0 时不设超时",
+    )
+    remind_catchup_rate: float = Field(
+        default=0.5,
+        description="启动时按原定时间顺序补发过时提醒的速率（个/秒），不大于 0 时不限速",
+    )
+    remind_catchup_max_age: float = Field(
+        default=0,
+        description="超过多少小时的过时提醒不再逐条补发，0 表示全部逐条补发",
+    )
+    remind_catchup_stale_action: Literal["drop", "summary"] = Field(
+        default="summary",
+        description="超过 remind_catchup_max_age 的过时提醒的处理方式：drop 直接丢弃，summary 按会话汇总为一条消息",
+    )
+    remind_journal_compact_threshold: int = Field(
+        default=1000,
+        description="journal 模式下累计多少条变更记录后压缩为新的快照",
+    )
 
 
 # 配置加载
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import random
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime
 
 import nonebot
 from nonebot.adapters.onebot.v11 import (
@@ -16,11 +17,17 @@ from nonebot_plugin_apscheduler import scheduler
 
 from .colloquial import colloquial_time
 from .common import task_info
-from .utils import save_tasks_to_file
+from .config import remind_config
+from .batcher import GroupReminderBatcher
+from .dispatcher import OneShotDispatcher
+from .model import Task, TaskType
+from .ratelimit import SendLimiter, SendTimeoutError
+from .storage import persist_task, persist_task_removal
+from .utils import add_task, pop_task
 
 
-async def set_date_reminder(event: Event, state: T_State):
-    """设置单次定时提醒"""
+async def set_date_reminder(event: Event, state: T_State) -> str:
+    """设置单次定时提醒，返回任务ID"""
     user_ids = state["user_ids"]  # 被提醒人的id列表，元素类型为str
     remind_time = state["remind_time"]  # datetime
     reminder_message = state["reminder_message"]  # Message
@@ -33,49 +40,33 @@ async def set_date_reminder(event: Event, state: T_State):
     if delay <= 0:
         raise ValueError("提醒时间已过，请设置未来的时间。")
 
-    # 给提醒时间加上随机秒数，防止同一秒发送过多消息被tx检测到
-    remind_time += timedelta(seconds=random.randint(0, 30))
-
     # 判断是私聊还是群聊
     is_group = isinstance(event, GroupMessageEvent)
     group_id = event.group_id if is_group else int(event.get_user_id())
 
-    # 添加定时任务
-    job = scheduler.add_job(
-        send_reminder,
-        "date",
-        run_date=remind_time,
-        args=[
-            None,
-            user_ids,
-            reminder_message,
-            is_group,
-            group_id,
-        ],  # 先将None作为任务ID传入
-    )
-
-    # 记录任务信息
-    task_id = job.id
-    # 更新定时任务参数，将任务ID传递进去
-    job.modify(args=[task_id, user_ids, reminder_message, is_group, group_id])
+    task_id = uuid.uuid4().hex
     logger.success(f"成功设置提醒任务:{remind_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
     # 获取任务发起者（提醒人）的ID
-    reminder_user_id = event.get_user_id()
-    task_info[task_id] = {
-        "task_id": task_id,  # str
-        "reminder_user_id": reminder_user_id,  # str
-        "user_ids": user_ids,  # str
-        "type": "datetime",  # str
-        "remind_time": remind_time,  # datetime
-        "reminder_message": reminder_message,  # Message
-        "is_group": is_group,  # bool
-        "group_id": group_id,  # int
-    }
-
-
-async def set_cron_reminder(event: Event, state: T_State):
-    """设置循环定时提醒"""
+    reminder_user_id = int(event.get_user_id())
+    task = Task(
+        task_id=task_id,
+        reminder_user_id=reminder_user_id,
+        user_ids=user_ids,
+        type=TaskType.DATETIME,
+        remind_time=remind_time,
+        reminder_message=reminder_message,
+        is_group=is_group,
+        group_id=group_id,
+    )
+    # 添加定时任务
+    schedule_task(task)
+    add_task(task)
+    return task_id
+
+
+async def set_cron_reminder(event: Event, state: T_State) -> str:
+    """设置循环定时提醒，返回任务ID"""
     user_ids = state["user_ids"]  # 被提醒人的id列表，元素类型为str
     cron_trigger = state["remind_time"]  # CronTrigger
     reminder_message = state["reminder_message"]  # Message
@@ -84,37 +75,67 @@ async def set_cron_reminder(event: Event, state: T_State):
     is_group = isinstance(event, GroupMessageEvent)
     group_id = event.group_id if is_group else int(event.get_user_id())
 
-    # 添加定时任务
-    job = scheduler.add_job(
-        send_reminder,
-        trigger=cron_trigger,
-        args=[
-            None,
-            user_ids,
-            reminder_message,
-            is_group,
-            group_id,
-        ],  # 先将None作为任务ID传入
-    )
-
-    # 记录任务信息
-    task_id = job.id
-    # 更新定时任务参数，将任务ID传递进去
-    job.modify(args=[task_id, user_ids, reminder_message, is_group, group_id])
+    task_id = uuid.uuid4().hex
     logger.success(f"成功设置提醒任务:{cron_trigger}")
 
     # 获取任务发起者（提醒人）的ID
-    reminder_user_id = event.get_user_id()
-    task_info[task_id] = {
-        "task_id": task_id,  # str
-        "reminder_user_id": reminder_user_id,  # str
-        "user_ids": user_ids,  # str
-        "type": "CronTrigger",  # str
-        "remind_time": cron_trigger,  # CronTrigger
-        "reminder_message": reminder_message,  # Message
-        "is_group": is_group,  # bool
-        "group_id": group_id,  # int
-    }
+    reminder_user_id = int(event.get_user_id())
+    task = Task(
+        task_id=task_id,
+        reminder_user_id=reminder_user_id,
+        user_ids=user_ids,
+        type=TaskType.CRON,
+        remind_time=cron_trigger,
+        reminder_message=reminder_message,
+        is_group=is_group,
+        group_id=group_id,
+    )
+    # 添加定时任务
+    schedule_task(task)
+    add_task(task)
+    return task_id
+
+
+def schedule_task(task: Task):
+    """为任务注册定时"""
+    if task.type is TaskType.DATETIME and remind_config.remind_dispatcher == "timer":
+        one_shot_dispatcher.add(task.task_id, task.remind_time)
+        return
+    args = [
+        task.task_id,
+        task.user_ids,
+        task.reminder_message,
+        task.is_group,
+        task.group_id,
+    ]
+    if task.type is TaskType.DATETIME:
+        scheduler.add_job(
+            send_reminder,
+            "date",
+            run_date=task.remind_time,
+            args=args,
+            id=task.task_id,
+            # 补发的过时提醒定在当前时刻，不能因错过执行时间而被跳过
+            misfire_grace_time=None,
+        )
+    else:
+        scheduler.add_job(
+            send_reminder,
+            trigger=task.remind_time,
+            args=args,
+            id=task.task_id,
+        )
+
+
+def unschedule_task(task_id: str) -> bool:
+    """取消任务的定时，返回定时是否存在"""
+    if one_shot_dispatcher.cancel(task_id):
+        return True
+    job = scheduler.get_job(task_id)
+    if job is None:
+        return False
+    job.remove()
+    return True
 
 
 # 设置定时提醒
@@ -126,9 +147,9 @@ async def set_reminder(event: Event, state: T_State):
 
     try:
         if isinstance(remind_time, datetime):
-            await set_date_reminder(event, state)
+            task_id = await set_date_reminder(event, state)
         else:
-            await set_cron_reminder(event, state)
+            task_id = await set_cron_reminder(event, state)
     except Exception as e:
         await bot.send(event, f"{type(e).__name__}: {e}")
         return
@@ -170,7 +191,7 @@ async def set_reminder(event: Event, state: T_State):
     await bot.send(event, msg)
 
     # 保存任务信息到文件
-    save_tasks_to_file()
+    persist_task(task_id)
 
 
 # 定义定时提醒函数
@@ -181,29 +202,76 @@ async def send_reminder(
     is_group: bool = False,
     group_id: int | None = None,
 ):
-    bot = nonebot.get_bot()
     str_msg = str(reminder_message)
-    if is_group:
-        message = user_ids + reminder_message
-        try:
-            await bot.send_group_msg(group_id=group_id, message=message)
-        except Exception as e:
-            await bot.send_group_msg(
-                group_id=group_id,
-                message=user_ids + f"\n{type(e).__name__}: {e}\n{str_msg}",
+    merge = is_group and remind_config.remind_merge_window > 0
+    try:
+        if merge:
+            await group_batcher.submit(group_id, user_ids, reminder_message)
+        elif is_group:
+            await _send_group_msg(group_id, user_ids + reminder_message)
+        else:
+            # 发送提醒信息到私聊，私聊时group_id即为用户qq号
+            await _send_private_msg(group_id, reminder_message)
+    except SendTimeoutError as e:
+        # 超时的请求可能已经送达，重发可能导致同一条提醒收到两次
+        logger.warning(f"提醒[{task_id}]{e}，不再重发")
+    except Exception as e:
+        if merge:
+            # 批次已经统一发送过附带错误信息的消息
+            raise
+        if is_group:
+            await _send_group_msg(
+                group_id, user_ids + f"\n{type(e).__name__}: {e}\n{str_msg}"
             )
-    else:
-        # 发送提醒信息到私聊，私聊时group_id即为用户qq号
-        try:
-            await bot.send_private_msg(user_id=group_id, message=reminder_message)
-        except Exception as e:
-            await bot.send_private_msg(
-                user_id=group_id, message=f"\n{type(e).__name__}: {e}\n{str_msg}"
+        else:
+            await _send_private_msg(
+                group_id, Message(f"\n{type(e).__name__}: {e}\n{str_msg}")
             )
 
     # 任务完成后从任务信息中移除，单次提醒才移除
-    if task_id in task_info and task_info[task_id]["type"] == "datetime":
-        del task_info[task_id]
+    if task_id in task_info and task_info[task_id].type is TaskType.DATETIME:
+        pop_task(task_id)
         msg = str_msg if len(str_msg) <= 20 else str_msg[:20] + "..."
         logger.success(f"成功发送提醒[{task_id}]:{msg!r}")
-        save_tasks_to_file()  # 更新任务信息到文件
+        persist_task_removal(task_id)  # 更新任务信息到文件
+
+
+async def _send_group_msg(group_id: int, message: Message):
+    bot = nonebot.get_bot()
+    await send_limiter.call(
+        ("group", group_id),
+        lambda: bot.send_group_msg(group_id=group_id, message=message),
+    )
+
+
+async def _send_private_msg(user_id: int, message: Message):
+    bot = nonebot.get_bot()
+    await send_limiter.call(
+        ("private", user_id),
+        lambda: bot.send_private_msg(user_id=user_id, message=message),
+    )
+
+
+async def _send_one_shot(task_id: str):
+    """单定时器调度触发的单次提醒"""
+    task = task_info.get(task_id)
+    if task is None:
+        return
+    await send_reminder(
+        task_id, task.user_ids, task.reminder_message, task.is_group, task.group_id
+    )
+
+
+# 同一时刻到期的提醒由令牌桶限速后依次发送，避免短时间发送过多消息被tx检测到
+send_limiter = SendLimiter(
+    rate=remind_config.remind_send_rate,
+    burst=remind_config.remind_send_burst,
+    chat_rate=remind_config.remind_chat_send_rate,
+    chat_burst=remind_config.remind_chat_send_burst,
+    concurrency=remind_config.remind_send_concurrency,
+    timeout=remind_config.remind_send_timeout,
+)
+one_shot_dispatcher = OneShotDispatcher(_send_one_shot)
+group_batcher = GroupReminderBatcher(
+    _send_group_msg, lambda: remind_config.remind_merge_window
+)
@@ -0,0 +1,108 @@
+"""单次提醒的单定时器调度模块。
+
+remind_dispatcher 为 timer 时，全部单次提醒不再各自创建 APScheduler 任务，
+而是按提醒时间放入一个最小堆，由一个 asyncio 定时器驱动，
+定时器总是指向堆顶最早的提醒。新增、取消、触发的开销均为 O(log n)。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+from collections.abc import Awaitable
+from datetime import datetime
+from itertools import count
+from typing import Callable
+
+from nonebot.log import logger
+
+# 单次最长等待秒数，定期醒来校正系统时间的跳变
+_MAX_SLEEP = 60.0
+
+
+class OneShotDispatcher:
+    def __init__(self, callback: Callable[[str], Awaitable[None]]):
+        self._callback = callback
+        # (时间戳, 序号, 任务ID)
+        self._heap: list[tuple[float, int, str]] = []
+        # 任务ID → 堆中仍然有效的条目，取消的条目留在堆中，到达堆顶时丢弃
+        self._entries: dict[str, tuple[float, int, str]] = {}
+        self._seq = count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_at: float | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, task_id: str, when: datetime):
+        """添加或改期单次提醒"""
+        self.cancel(task_id)
+        entry = (when.timestamp(), next(self._seq), task_id)
+        self._entries[task_id] = entry
+        heapq.heappush(self._heap, entry)
+        if self._timer_at is None or entry[0] < self._timer_at:
+            self._arm()
+
+    def cancel(self, task_id: str) -> bool:
+        """取消单次提醒，返回是否存在该提醒"""
+        if self._entries.pop(task_id, None) is None:
+            return False
+        # 失效条目过多时重建堆，避免堆无限增长
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+        return True
+
+    def peek(self) -> tuple[str, datetime] | None:
+        """返回最早的提醒 (任务ID, 提醒时间)"""
+        self._drop_cancelled()
+        if not self._heap:
+            return None
+        ts, _, task_id = self._heap[0]
+        return task_id, datetime.fromtimestamp(ts)
+
+    def _drop_cancelled(self):
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+
+    def _arm(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_at = None
+        self._drop_cancelled()
+        if not self._heap:
+            return
+        loop = asyncio.get_running_loop()
+        when = self._heap[0][0]
+        delay = min(max(when - time.time(), 0.0), _MAX_SLEEP)
+        self._timer_at = when
+        self._timer = loop.call_at(loop.time() + delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._timer_at = None
+        now = time.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            task_id = entry[2]
+            if self._entries.get(task_id) is not entry:
+                continue
+            del self._entries[task_id]
+            task = asyncio.ensure_future(self._fire(task_id))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        self._arm()
+
+    async def _fire(self, task_id: str):
+        try:
+            await self._callback(task_id)
+        except Exception as e:
+            logger.opt(exception=e).error(f"发送提醒[{task_id}]失败: {e}")
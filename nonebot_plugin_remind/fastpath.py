@@ -0,0 +1,204 @@
+"""常见单次提醒时间表达式的快速解析模块。
+
+大部分时间表达式都很简单（"14:30"、"2026-3-15 9:00"、"10分钟后"、"两个小时后"、
+"明天下午3点"），用预编译的正则直接解析，结果与 jio.parse_time 的起始时间一致；
+无法匹配或存在歧义的表达式返回 None，交给 jionlp 完整解析。
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+
+_CN_DIGITS = {
+    "零": 0,
+    "〇": 0,
+    "一": 1,
+    "二": 2,
+    "两": 2,
+    "三": 3,
+    "四": 4,
+    "五": 5,
+    "六": 6,
+    "七": 7,
+    "八": 8,
+    "九": 9,
+}
+
+_NUM = r"\d{1,2}|[零〇一二两三四五六七八九十]{1,3}"
+
+# 相对时间：10分钟后、两个小时后、半小时后、一个半小时后、30秒后、一刻钟后
+_RELATIVE = re.compile(
+    rf"^(?:(?P<num>{_NUM})个?(?P<half>半)?|(?P<only_half>半)个?)"
+    r"(?P<unit>小时|钟头|分钟|分|秒钟|秒)(?P<suffix>之后|以后|后)$"
+    rf"|^(?P<quarter>{_NUM})刻钟(?:之后|以后|后)$"
+)
+
+# 时刻：14:30、8点、8点05、8点5分、3点半、3点整、8时、8时30分
+_CLOCK = (
+    rf"(?P<hour>{_NUM})"
+    r"(?::(?P<colon_min>\d{2})"
+    r"|点(?:(?P<dot_min>\d{2})|(?P<dot_min_unit>\d{1,2})分|(?P<dot_half>半)|整)?"
+    r"|时(?:(?P<hour_min>\d{1,2})分)?)"
+)
+_PERIOD = r"(?P<period>凌晨|早上|早晨|上午|中午|下午|傍晚|晚上)?"
+
+# 今天/明天/后天/大后天/今晚 + 可选时段 + 可选时刻
+_DAY_CLOCK = re.compile(
+    rf"^(?:(?P<day>今天|明天|后天|大后天)|(?P<tonight>今晚))?{_PERIOD}(?:{_CLOCK})?$"
+)
+
+# 2026-3-15、2026/3/15、2026.3.15、2026年3月15日、3月15日、3-15 + 可选时段和时刻
+# 没有年份时不接受"."分隔，"8.30"、"22.35"更可能是时刻，jionlp 也无法解析
+_DATE_CLOCK = re.compile(
+    r"^(?:(?P<year>\d{4})[-/.年])?"
+    r"(?P<month>\d{1,2})(?(year)[-/.月]|[-/月])(?P<mday>\d{1,2})"
+    rf"(?P<mday_unit>[日号])?(?P<space> )?{_PERIOD}(?:{_CLOCK})?$"
+)
+
+_DAY_OFFSETS = {"今天": 0, "明天": 1, "后天": 2, "大后天": 3}
+_HOUR_UNITS = ("小时", "钟头")
+_UNIT_SECONDS = {
+    "小时": 3600,
+    "钟头": 3600,
+    "分钟": 60,
+    "分": 60,
+    "秒钟": 1,
+    "秒": 1,
+}
+
+
+def _cn_to_int(text: str) -> int | None:
+    """解析 0~99 的阿拉伯数字或中文数字"""
+    if text.isdigit():
+        return int(text)
+    if "十" not in text:
+        return _CN_DIGITS.get(text) if len(text) == 1 else None
+    tens, _, ones = text.partition("十")
+    tens_value = _CN_DIGITS.get(tens) if tens else 1
+    ones_value = _CN_DIGITS.get(ones) if ones else 0
+    if tens_value is None or ones_value is None:
+        return None
+    return tens_value * 10 + ones_value
+
+
+def _period_hour(period: str | None, hour: int) -> int | None:
+    """按时段换算 24 小时制，与 jionlp 不一致或有歧义的组合返回 None"""
+    if period is None:
+        return hour if hour <= 23 else None
+    if period in ("凌晨", "早上", "早晨"):
+        return hour if hour <= 11 else None
+    if period == "上午":
+        return hour if hour <= 12 else None
+    if period == "中午":
+        if hour == 12:
+            return 12
+        return hour + 12 if 1 <= hour <= 2 else None
+    if period == "下午":
+        if 1 <= hour <= 11:
+            return hour + 12
+        return hour if 12 <= hour <= 23 else None
+    if period == "傍晚":
+        return hour + 12 if 5 <= hour <= 7 else None
+    # 晚上
+    return hour + 12 if 6 <= hour <= 11 else None
+
+
+def _clock(match: re.Match, period: str | None) -> tuple[int, int] | None:
+    """返回 (时, 分)，没有时刻时为 (0, 0)"""
+    if match.group("hour") is None:
+        # 只有时段没有时刻交给 jionlp
+        return None if period else (0, 0)
+    hour = _cn_to_int(match.group("hour"))
+    if hour is None:
+        return None
+    hour = _period_hour(period, hour)
+    if hour is None:
+        return None
+    minute_text = (
+        match.group("colon_min")
+        or match.group("dot_min")
+        or match.group("dot_min_unit")
+        or match.group("hour_min")
+    )
+    minute = 30 if match.group("dot_half") else int(minute_text or 0)
+    if minute > 59:
+        return None
+    return hour, minute
+
+
+def _parse_relative(match: re.Match, base: datetime) -> datetime | None:
+    if match.group("quarter") is not None:
+        quarters = _cn_to_int(match.group("quarter"))
+        if quarters is None or not 1 <= quarters <= 3:
+            return None
+        return base + timedelta(minutes=15 * quarters)
+    unit = match.group("unit")
+    # jionlp 对"N小时之后/以后"取整到分钟，这类表达式交给 jionlp
+    if unit in _HOUR_UNITS and match.group("suffix") != "后":
+        return None
+    if match.group("only_half"):
+        if unit not in _HOUR_UNITS:
+            return None
+        amount = 0.5
+    else:
+        amount = _cn_to_int(match.group("num"))
+        if amount is None or amount == 0:
+            return None
+        if match.group("half"):
+            # jionlp 只能正确识别"一个半"到"九个半"
+            if amount > 9 or unit not in _HOUR_UNITS:
+                return None
+            amount += 0.5
+    seconds = amount * _UNIT_SECONDS[unit]
+    if seconds != int(seconds):
+        return None
+    return base + timedelta(seconds=int(seconds))
+
+
+def fast_parse_time(text: str, base: datetime) -> datetime | None:
+    """快速解析常见单次时间表达式，text 需已规范化（全角转半角、去除首尾空白）
+
+    base 为当前时刻（精确到秒），无法快速解析时返回 None。
+    """
+    if match := _RELATIVE.match(text):
+        return _parse_relative(match, base)
+
+    if match := _DAY_CLOCK.match(text):
+        if match.group("tonight"):
+            if match.group("period"):
+                return None
+            offset, period = 0, "晚上"
+        else:
+            offset = _DAY_OFFSETS.get(match.group("day"), 0)
+            period = match.group("period")
+            if match.group("day") is None and match.group("hour") is None:
+                # 空串或只有时段
+                return None
+        clock = _clock(match, period)
+        if clock is None:
+            return None
+        day = base.date() + timedelta(days=offset)
+        return datetime(day.year, day.month, day.day, *clock)
+
+    if match := _DATE_CLOCK.match(text):
+        # "2026-3-159:00" 无法区分日期和时刻的边界
+        if (
+            match.group("hour") is not None
+            and not match.group("mday_unit")
+            and not match.group("space")
+            and not match.group("period")
+        ):
+            return None
+        clock = _clock(match, match.group("period"))
+        if clock is None:
+            return None
+        year = int(match.group("year") or base.year)
+        try:
+            return datetime(
+                year, int(match.group("month")), int(match.group("mday")), *clock
+            )
+        except ValueError:
+            return None
+
+    return None
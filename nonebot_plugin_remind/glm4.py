@@ -1,36 +1,368 @@
 # pyright: reportArgumentType=false, reportAttributeAccessIssue=false, reportReturnType=false
+from __future__ import annotations
+
 import asyncio
+import json
+import re
+import threading
+import time
 import warnings
+from collections.abc import Awaitable
 from datetime import datetime
+from typing import Callable
 
 from nonebot.log import logger
 
-# zhipuai 导入时会触发 Pydantic V1 兼容性 UserWarning，屏蔽
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", category=UserWarning, module="zhipuai")
-    from zhipuai import ZhipuAI
-
+from .breaker import CircuitBreaker
 from .config import remind_config
 
 GLM_4_MODEL = remind_config.glm_4_model
 GLM_4_MODEL_CRON = remind_config.glm_4_model_cron
 GLM_API_KEY = remind_config.glm_api_key
 
+# 同时保持的 HTTP 连接数
+_MAX_CONNECTIONS = 8
+# 异步补全轮询结果的初始间隔、增长倍数和最大间隔（秒）
+_POLL_INITIAL = 0.05
+_POLL_FACTOR = 1.5
+_POLL_MAX = 1.0
 
-async def parsed_datetime_glm4(time_text: str):
-    """异步调用GLM-4的API解析时间"""
-    if time_text == "":
-        return "None"
-    if GLM_4_MODEL == "" or GLM_API_KEY == "":
-        logger.warning("未配置GLM模型或API_KEY")
-        return "None"
-    client = ZhipuAI(api_key=GLM_API_KEY)  # 请填写您自己的APIKey
-    response = client.chat.asyncCompletions.create(
-        model=GLM_4_MODEL,  # 请填写您要调用的模型名称
-        messages=[
+_client = None
+_client_lock = threading.Lock()
+
+# 限制同时进行的 GLM-4 请求数，惰性创建，确保绑定到运行中的事件循环
+_gate: asyncio.Semaphore | None = None
+# GLM-4 接口连续失败或超时后熔断，冷却期内直接按无法解析处理
+_breaker = CircuitBreaker(
+    remind_config.glm_breaker_threshold, remind_config.glm_breaker_cooldown
+)
+
+
+def _zhipuai_client():
+    """返回共享的 ZhipuAI 客户端，zhipuai 只在配置了 API_KEY 并实际调用时才导入
+
+    所有请求共用一个客户端及其 HTTP 连接池，避免每次解析都重新建立连接。
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+
+                # zhipuai 导入时会触发 Pydantic V1 兼容性 UserWarning，屏蔽
+                with warnings.catch_warnings():
+                    warnings.filterwarnings(
+                        "ignore", category=UserWarning, module="zhipuai"
+                    )
+                    from zhipuai import ZhipuAI
+
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=_MAX_CONNECTIONS,
+                        max_keepalive_connections=_MAX_CONNECTIONS,
+                    )
+                )
+                _client = ZhipuAI(api_key=GLM_API_KEY, http_client=http_client)
+    return _client
+
+
+async def _get_client():
+    """返回共享客户端，首次调用时导入 zhipuai 并创建客户端较慢，放到线程中进行"""
+    if _client is not None:
+        return _client
+    return await asyncio.to_thread(_zhipuai_client)
+
+
+def close_glm_client():
+    """关闭共享客户端的连接池"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def _async_completion(
+    model: str, messages: list, temperature: float, max_tokens: int, deadline: float
+) -> str:
+    """提交异步补全任务，以逐步加长的间隔轮询结果直到截止时间
+
+    zhipuai SDK 是同步的，所有请求都放到线程中执行，不阻塞事件循环。
+    """
+    client = await _get_client()
+    response = await asyncio.to_thread(
+        client.chat.asyncCompletions.create,
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=max(deadline - time.monotonic(), 0.1),
+    )
+    logger.debug(response)
+
+    task_id = response.id
+    interval = _POLL_INITIAL
+    while True:
+        result_response = await asyncio.to_thread(
+            client.chat.asyncCompletions.retrieve_completion_result,
+            id=task_id,
+            timeout=max(deadline - time.monotonic(), 0.1),
+        )
+        logger.debug(result_response)
+        task_status = result_response.task_status
+        if task_status == "FAILED":
+            return "Failed"
+        if task_status == "SUCCESS":
+            return result_response.choices[0].message.content
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * _POLL_FACTOR, _POLL_MAX)
+
+
+async def _sync_completion(
+    model: str, messages: list, temperature: float, max_tokens: int, deadline: float
+) -> str:
+    """调用同步补全接口，一次请求直接得到结果"""
+    client = await _get_client()
+    response = await asyncio.to_thread(
+        client.chat.completions.create,
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=max(deadline - time.monotonic(), 0.1),
+    )
+    logger.debug(response)
+    return response.choices[0].message.content
+
+
+def _read_stream(
+    model: str, messages: list, temperature: float, max_tokens: int, timeout: float
+) -> str:
+    client = _zhipuai_client()
+    chunks = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+        timeout=timeout,
+    )
+    parts = []
+    for chunk in chunks:
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+    return "".join(parts)
+
+
+async def _stream_completion(
+    model: str, messages: list, temperature: float, max_tokens: int, deadline: float
+) -> str:
+    """调用流式补全接口，在线程中读完整个流"""
+    return await asyncio.to_thread(
+        _read_stream,
+        model,
+        messages,
+        temperature,
+        max_tokens,
+        max(deadline - time.monotonic(), 0.1),
+    )
+
+
+_COMPLETIONS = {
+    "async": _async_completion,
+    "sync": _sync_completion,
+    "stream": _stream_completion,
+}
+
+
+async def _complete(
+    model: str,
+    messages: list,
+    temperature: float,
+    max_tokens: int,
+    deadline: float,
+) -> str:
+    """按 glm_completion_mode 调用补全接口
+
+    deadline 为 time.monotonic() 的截止时间，同时进行的请求数不超过 glm_concurrency，
+    排队和请求到截止时间仍未完成返回 "Timeout"，出错返回 "Error"，熔断期间直接返回 "Unavailable"。
+    """
+    global _gate
+    start = time.monotonic()
+    if deadline <= start:
+        return "Timeout"
+    if not _breaker.allow():
+        logger.warning("GLM-4 接口连续失败，已暂停调用")
+        return "Unavailable"
+    if _gate is None:
+        _gate = asyncio.Semaphore(max(remind_config.glm_concurrency, 1))
+    mode = remind_config.glm_completion_mode
+    try:
+        await asyncio.wait_for(_gate.acquire(), deadline - start)
+    except (asyncio.TimeoutError, TimeoutError):
+        _breaker.release()
+        logger.warning(f"GLM-4 请求排队超时（{deadline - start:.2f} 秒）")
+        return "Timeout"
+    except asyncio.CancelledError:
+        _breaker.release()
+        raise
+    try:
+        content = await asyncio.wait_for(
+            _COMPLETIONS[mode](model, messages, temperature, max_tokens, deadline),
+            max(deadline - time.monotonic(), 0),
+        )
+    except (asyncio.TimeoutError, TimeoutError):
+        _breaker.record_failure()
+        logger.warning(
+            f"GLM API查询超时（{mode} 模式，{time.monotonic() - start:.2f} 秒）"
+        )
+        return "Timeout"
+    except asyncio.CancelledError:
+        _breaker.release()
+        raise
+    except Exception as e:
+        _breaker.record_failure()
+        logger.error(f"GLM API查询出错（{mode} 模式）: {type(e).__name__}: {e}")
+        return "Error"
+    finally:
+        _gate.release()
+    elapsed = time.monotonic() - start
+    if content == "Failed":
+        _breaker.record_failure()
+        logger.error(
+            f"基于{model}模型的解析失败！（{mode} 模式，用时 {elapsed:.2f} 秒）"
+        )
+        return content
+    _breaker.record_success()
+    logger.success(
+        f"基于{model}模型的解析结果：{content}（{mode} 模式，用时 {elapsed:.2f} 秒）"
+    )
+    return content
+
+
+# ── 批量解析 ────────────────────────────────────────────────
+
+# 调用出错时的回复，批量请求得到这些回复时直接返回给所有等待者
+_ERRORS = ("Error", "Failed", "Timeout", "Unavailable")
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+class _GLMBatcher:
+    """有请求正在进行时，在 glm_batch_window 秒内收集待解析的文本，合并为一次请求
+
+    single 在截止时间前解析一条文本，batch 解析多条文本并返回 {文本: 回复}，
+    批量回复中缺失或格式不对的条目再逐个解析。每个调用者从提交起共用 glm_timeout 秒，
+    等待合并、批量请求和逐个解析都计入其中。
+    """
+
+    def __init__(
+        self,
+        single: Callable[[str, float], Awaitable[str]],
+        batch: Callable[[list[str], float], Awaitable[dict[str, str]]],
+    ):
+        self._single = single
+        self._batch = batch
+        self._pending: list[tuple[str, float, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        # 正在进行的单独请求数
+        self._running = 0
+
+    async def submit(self, text: str) -> str:
+        deadline = time.monotonic() + remind_config.glm_timeout
+        window = remind_config.glm_batch_window
+        # 没有其他请求进行或等待时没有可合并的请求，直接发送
+        if window <= 0 or not (self._running or self._tasks or self._pending):
+            self._running += 1
+            try:
+                return await self._single(text, deadline)
+            finally:
+                self._running -= 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, deadline, future))
+        if len(self._pending) >= remind_config.glm_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._pending = self._pending, []
+        if items:
+            task = asyncio.create_task(self._run(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, items: list[tuple[str, float, asyncio.Future]]):
+        # 同一文本按最早的截止时间解析
+        deadlines: dict[str, float] = {}
+        for text, deadline, _ in items:
+            deadlines[text] = min(deadline, deadlines.get(text, deadline))
+        texts = list(deadlines)
+        try:
+            if len(texts) == 1:
+                results = {texts[0]: await self._single(texts[0], deadlines[texts[0]])}
+            else:
+                results = await self._batch(texts, min(deadlines.values()))
+                missing = [text for text in texts if text not in results]
+                if missing:
+                    logger.info(f"GLM-4 批量解析有 {len(missing)} 条未得到结果，逐条解析")
+                    answers = await asyncio.gather(
+                        *(self._single(text, deadlines[text]) for text in missing)
+                    )
+                    results.update(zip(missing, answers))
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for text, _, future in items:
+            if not future.done():
+                future.set_result(results[text])
+
+
+def _load_answers(content: str, count: int) -> list | None:
+    """解析批量回复中的 JSON 数组，数组长度不对时返回 None"""
+    try:
+        answers = json.loads(_CODE_FENCE.sub("", content.strip()))
+    except ValueError:
+        return None
+    if not isinstance(answers, list) or len(answers) != count:
+        return None
+    return answers
+
+
+# ── 单次提醒 ────────────────────────────────────────────────
+
+
+def _datetime_prompt() -> str:
+    return f'当前时间是{datetime.now().strftime("%Y-%m-%d %H:%M")}（24小时制时间），我提供一个关于时间的表述，请你以当前时间为基准，仅回复我一个未来最符合该表述的时间，采用"YYYY-MM-DD HH:MM"的格式回复24小时制时间（提示：晚上12点或者24点都应回复为第二天的0点）；如果表述中不能明确是上午或是下午则默认按上午来回复。特殊情况：如果符合的时间早于当前 或者 如果我提供的表述无法表示正确的时间则回复"None"。'
+
+
+def _valid_datetime_answer(answer) -> bool:
+    if answer == "None":
+        return True
+    try:
+        datetime.strptime(answer, "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+async def _single_datetime(time_text: str, deadline: float) -> str:
+    return await _complete(
+        GLM_4_MODEL,
+        [
             {
                 "role": "system",
-                "content": f'当前时间是{datetime.now().strftime("%Y-%m-%d %H:%M")}（24小时制时间），我提供一个关于时间的表述，请你以当前时间为基准，仅回复我一个未来最符合该表述的时间，采用"YYYY-MM-DD HH:MM"的格式回复24小时制时间（提示：晚上12点或者24点都应回复为第二天的0点）；如果表述中不能明确是上午或是下午则默认按上午来回复。特殊情况：如果符合的时间早于当前 或者 如果我提供的表述无法表示正确的时间则回复"None"。',
+                "content": _datetime_prompt(),
             },
             {
                 "role": "user",
@@ -39,50 +371,65 @@ async def parsed_datetime_glm4(time_text: str):
         ],
         temperature=0.25,
         max_tokens=20,
+        deadline=deadline,
     )
-    logger.debug(response)
 
-    task_id = response.id
-    task_status = ""
-    get_cnt = 0  # 限制查询10次
 
-    while task_status != "SUCCESS" and task_status != "FAILED" and get_cnt <= 10:
-        result_response = client.chat.asyncCompletions.retrieve_completion_result(
-            id=task_id
-        )
-        logger.debug(result_response)
-        task_status = result_response.task_status
-        if task_status == "FAILED":
-            logger.error(f"基于{GLM_4_MODEL}模型的解析失败！")
-            return "Failed"
-        if task_status == "SUCCESS":
-            logger.success(
-                f"基于{GLM_4_MODEL}模型的解析结果：{result_response.choices[0].message.content}"
-            )
-            return result_response.choices[0].message.content
+async def _batch_datetime(texts: list[str], deadline: float) -> dict[str, str]:
+    content = await _complete(
+        GLM_4_MODEL,
+        [
+            {
+                "role": "system",
+                "content": _datetime_prompt()
+                + '现在我会用一个JSON数组提供多个表述，请按同样的顺序逐个回复，仅回复一个等长的JSON字符串数组（不要用makedown的代码块包裹），例如["2024-01-01 08:00", "None"]。',
+            },
+            {
+                "role": "user",
+                "content": json.dumps(texts, ensure_ascii=False),
+            },
+        ],
+        temperature=0.25,
+        max_tokens=20 * len(texts) + 20,
+        deadline=deadline,
+    )
+    if content in _ERRORS:
+        return dict.fromkeys(texts, content)
+    answers = _load_answers(content, len(texts))
+    if answers is None:
+        return {}
+    return {
+        text: answer
+        for text, answer in zip(texts, answers)
+        if _valid_datetime_answer(answer)
+    }
 
-        # 每隔1秒查询一次结果
-        await asyncio.sleep(1)
-        get_cnt += 1
 
-    logger.warning("GLM API查询超时")
-    return "Timeout"
+_datetime_batcher = _GLMBatcher(_single_datetime, _batch_datetime)
 
 
-async def parsed_cron_time_glm4(time_text: str) -> str:
-    """异步调用GLM-4的API解析CronTrigger()的参数"""
+async def parsed_datetime_glm4(time_text: str):
+    """异步调用GLM-4的API解析时间，同时到达的多个请求合并为一次调用"""
     if time_text == "":
         return "None"
-    if GLM_4_MODEL_CRON == "" or GLM_API_KEY == "":
+    if GLM_4_MODEL == "" or GLM_API_KEY == "":
         logger.warning("未配置GLM模型或API_KEY")
         return "None"
-    client = ZhipuAI(api_key=GLM_API_KEY)  # 请填写您自己的APIKey
-    response = client.chat.asyncCompletions.create(
-        model=GLM_4_MODEL_CRON,  # 请填写您要调用的模型名称
-        messages=[
+    return await _datetime_batcher.submit(time_text)
+
+
+# ── 循环提醒 ────────────────────────────────────────────────
+
+_CRON_PROMPT = "我提供一个时间的文本表述用于创建python中的CronTrigger()实例来实现定时，请你仅回复一个参数字典（不要用makedown的代码块包裹），用于向CronTrigger()中传递参数。"
+
+
+async def _single_cron(time_text: str, deadline: float) -> str:
+    return await _complete(
+        GLM_4_MODEL_CRON,
+        [
             {
                 "role": "system",
-                "content": "我提供一个时间的文本表述用于创建python中的CronTrigger()实例来实现定时，请你仅回复一个参数字典（不要用makedown的代码块包裹），用于向CronTrigger()中传递参数。",
+                "content": _CRON_PROMPT,
             },
             {
                 "role": "user",
@@ -91,30 +438,51 @@ async def parsed_cron_time_glm4(time_text: str) -> str:
         ],
         temperature=0.75,
         max_tokens=40,
+        deadline=deadline,
     )
-    logger.debug(response)
 
-    task_id = response.id
-    task_status = ""
-    get_cnt = 0  # 限制查询10次
 
-    while task_status != "SUCCESS" and task_status != "FAILED" and get_cnt <= 10:
-        result_response = client.chat.asyncCompletions.retrieve_completion_result(
-            id=task_id
-        )
-        logger.debug(result_response)
-        task_status = result_response.task_status
-        if task_status == "FAILED":
-            logger.error(f"基于{GLM_4_MODEL_CRON}模型的解析失败！")
-            return "Failed"
-        if task_status == "SUCCESS":
-            logger.success(
-                f"基于{GLM_4_MODEL_CRON}模型的解析结果：{result_response.choices[0].message.content}"
-            )
-            return result_response.choices[0].message.content
+async def _batch_cron(texts: list[str], deadline: float) -> dict[str, str]:
+    content = await _complete(
+        GLM_4_MODEL_CRON,
+        [
+            {
+                "role": "system",
+                "content": _CRON_PROMPT
+                + '现在我会用一个JSON数组提供多个表述，请按同样的顺序逐个回复，仅回复一个等长的JSON数组，每个元素是对应的参数对象，无法表示的表述回复"None"，例如[{"hour": 8, "minute": 0}, "None"]。',
+            },
+            {
+                "role": "user",
+                "content": json.dumps(texts, ensure_ascii=False),
+            },
+        ],
+        temperature=0.75,
+        max_tokens=40 * len(texts) + 20,
+        deadline=deadline,
+    )
+    if content in _ERRORS:
+        return dict.fromkeys(texts, content)
+    answers = _load_answers(content, len(texts))
+    if answers is None:
+        return {}
+    results = {}
+    for text, answer in zip(texts, answers):
+        if answer == "None":
+            results[text] = answer
+        elif isinstance(answer, dict):
+            # 转为 Python 字面量，与单条回复一样由 ast.literal_eval 解析
+            results[text] = repr(answer)
+    return results
+
 
-        # 每隔1秒查询一次结果
-        await asyncio.sleep(1)
-        get_cnt += 1
+_cron_batcher = _GLMBatcher(_single_cron, _batch_cron)
 
-    return "Timeout"
+
+async def parsed_cron_time_glm4(time_text: str) -> str:
+    """异步调用GLM-4的API解析CronTrigger()的参数，同时到达的多个请求合并为一次调用"""
+    if time_text == "":
+        return "None"
+    if GLM_4_MODEL_CRON == "" or GLM_API_KEY == "":
+        logger.warning("未配置GLM模型或API_KEY")
+        return "None"
+    return await _cron_batcher.submit(time_text)
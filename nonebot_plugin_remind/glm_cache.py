@@ -0,0 +1,100 @@
+"""GLM-4 解析结果的持久化缓存模块。
+
+GLM-4 调用慢且计费，而无法被 jionlp 解析的说法往往会被反复使用。
+单次提醒的结果以 (规范化文本, 锚定日期或时刻) 为键，循环提醒的结果与当前时间无关，只以文本为键；
+模型回复"None"（无法解析）的结果只保留 glm_cache_negative_ttl 秒。
+缓存按最近使用顺序保存在 localstore 的缓存目录中，重启后仍然有效，超过 glm_cache_size 条时淘汰最久未使用的条目。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+from nonebot.log import logger
+
+from .common import GLM_CACHE_FILE
+from .config import remind_config
+from .lru import LRUCache
+
+_write_lock = threading.Lock()
+
+
+class GLMResultCache:
+    def __init__(self, maxsize: int, negative_ttl: float):
+        self._negative_ttl = negative_ttl
+        # 键 → (模型回复, 是否为无法解析, 写入时间戳)
+        self._cache: LRUCache[str, tuple[str, bool, float]] = LRUCache(maxsize)
+        self._loaded = False
+
+    @staticmethod
+    def _key(kind: str, text: str, anchor: str) -> str:
+        return f"{kind}\t{anchor}\t{text}"
+
+    def _load(self):
+        self._loaded = True
+        if self._cache.maxsize <= 0 or not GLM_CACHE_FILE.exists():
+            return
+        try:
+            entries = json.loads(GLM_CACHE_FILE.read_text(encoding="utf-8"))
+            for key, result, negative, stored_at in entries:
+                self._cache.put(key, (result, negative, stored_at))
+        except Exception as e:
+            logger.warning(f"读取 GLM 解析缓存失败，已忽略: {e}")
+            self._cache.clear()
+
+    def _valid(self, entry: tuple[str, bool, float]) -> bool:
+        _, negative, stored_at = entry
+        return not negative or time.time() - stored_at <= self._negative_ttl
+
+    def get(self, kind: str, text: str, anchor: str = "") -> str | None:
+        """查询缓存的模型回复，未命中或已过期时返回 None"""
+        if not self._loaded:
+            self._load()
+        entry = self._cache.get(self._key(kind, text, anchor), valid=self._valid)
+        return None if entry is None else entry[0]
+
+    async def put(
+        self,
+        kind: str,
+        text: str,
+        result: str,
+        anchor: str = "",
+        negative: bool = False,
+    ):
+        """记录模型回复并在后台线程中写入文件"""
+        if self._cache.maxsize <= 0:
+            return
+        if not self._loaded:
+            self._load()
+        self._cache.put(self._key(kind, text, anchor), (result, negative, time.time()))
+        entries = [
+            [key, *entry] for key, entry in self._cache.items() if self._valid(entry)
+        ]
+        try:
+            await asyncio.to_thread(_write_entries, entries)
+        except Exception as e:
+            logger.warning(f"保存 GLM 解析缓存失败: {e}")
+
+    def stats(self) -> dict:
+        if not self._loaded:
+            self._load()
+        stats = self._cache.stats()
+        stats["negative"] = sum(1 for _, entry in self._cache.items() if entry[1])
+        return stats
+
+
+def _write_entries(entries: list):
+    tmp_file = GLM_CACHE_FILE.with_name(GLM_CACHE_FILE.name + ".tmp")
+    with _write_lock:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, GLM_CACHE_FILE)
+
+
+glm_cache = GLMResultCache(
+    remind_config.glm_cache_size, remind_config.glm_cache_negative_ttl
+)
@@ -0,0 +1,125 @@
+"""任务二级索引模块。
+
+维护 用户 → 会话 → 任务类型 → 任务ID 以及 会话 → 任务ID 两组索引，
+提醒列表和删除命令只需访问当前用户自己的任务，开销与全部任务数无关。
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import count
+
+from .model import Task, TaskType
+
+
+class _Bucket:
+    """同一用户、同一会话、同一类型的任务"""
+
+    __slots__ = ("by_seq", "by_time")
+
+    def __init__(self):
+        # 任务ID → 设置序号，dict 保持插入顺序即设置顺序
+        self.by_seq: dict[str, int] = {}
+        # (提醒时间, 设置序号, 任务ID)，仅单次提醒使用
+        self.by_time: list[tuple[datetime, int, str]] = []
+
+
+class TaskIndex:
+    def __init__(self):
+        self._users: dict[int, dict[int, dict[TaskType, _Bucket]]] = {}
+        self._groups: dict[int, dict[str, None]] = {}
+        # 任务ID → (用户, 会话, 类型, 按时间排序的键)
+        self._keys: dict[str, tuple] = {}
+        self._seq = count()
+
+    def clear(self):
+        self._users.clear()
+        self._groups.clear()
+        self._keys.clear()
+
+    def add(self, task: Task):
+        task_id = task.task_id
+        if task_id in self._keys:
+            self.remove(task_id)
+        user = task.reminder_user_id
+        group = task.group_id
+        task_type = task.type
+        seq = next(self._seq)
+        bucket = (
+            self._users.setdefault(user, {})
+            .setdefault(group, {})
+            .setdefault(task_type, _Bucket())
+        )
+        bucket.by_seq[task_id] = seq
+        time_key = None
+        if task_type is TaskType.DATETIME:
+            time_key = (task.remind_time, seq, task_id)
+            insort(bucket.by_time, time_key)
+        self._groups.setdefault(group, {})[task_id] = None
+        self._keys[task_id] = (user, group, task_type, time_key)
+
+    def remove(self, task_id: str):
+        key = self._keys.pop(task_id, None)
+        if key is None:
+            return
+        user, group, task_type, time_key = key
+        groups = self._users[user]
+        types = groups[group]
+        bucket = types[task_type]
+        del bucket.by_seq[task_id]
+        if time_key is not None:
+            pos = bisect_left(bucket.by_time, time_key)
+            del bucket.by_time[pos]
+        # 清理空的索引层级
+        if not bucket.by_seq:
+            del types[task_type]
+            if not types:
+                del groups[group]
+                if not groups:
+                    del self._users[user]
+        group_tasks = self._groups[group]
+        del group_tasks[task_id]
+        if not group_tasks:
+            del self._groups[group]
+
+    def user_task_ids(
+        self,
+        user_id: int,
+        group_id: int | None,
+        task_type: TaskType,
+        sort: bool,
+    ) -> list[str]:
+        """查询用户任务ID
+
+        参数：
+            user_id:int 提醒人用户id
+            group_id:int 会话id, None 表示该用户全部会话
+            task_type:TaskType 任务类型
+            sort:bool 是否按提醒时间排序，否则按设置顺序
+        """
+        groups = self._users.get(user_id, {})
+        if group_id is None:
+            buckets = [
+                types[task_type] for types in groups.values() if task_type in types
+            ]
+        else:
+            bucket = groups.get(group_id, {}).get(task_type)
+            buckets = [bucket] if bucket is not None else []
+        if not buckets:
+            return []
+        if sort and task_type is TaskType.DATETIME:
+            if len(buckets) == 1:
+                return [key[2] for key in buckets[0].by_time]
+            return [key[2] for key in heapq.merge(*(b.by_time for b in buckets))]
+        if len(buckets) == 1:
+            return list(buckets[0].by_seq)
+        merged = heapq.merge(
+            *([(seq, tid) for tid, seq in b.by_seq.items()] for b in buckets)
+        )
+        return [tid for _, tid in merged]
+
+    def group_task_ids(self, group_id: int) -> list[str]:
+        """查询会话中的全部任务ID"""
+        return list(self._groups.get(group_id, ()))
@@ -0,0 +1,144 @@
+"""追加式任务日志模块。
+
+journal 模式下，任务的每次新增/删除都以一行记录追加到日志文件，
+累计到一定数量后在后台把内存中的全部任务压缩为新的快照并清空日志。
+启动时先读取快照，再按顺序重放日志即可恢复全部任务。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+
+from nonebot.log import logger
+
+from .codec import decode_task, encode_task
+from .common import JOURNAL_FILE, task_info, tasks_ready
+from .config import remind_config
+from .model import Task
+from .utils import write_tasks_file
+
+# 压缩过程中被轮换出来、尚未并入快照的旧日志
+ROTATED_JOURNAL_FILE = JOURNAL_FILE.with_name(JOURNAL_FILE.name + ".1")
+
+_journal_file = None
+_record_count = 0
+_compaction: asyncio.Task | None = None
+
+
+def append_record(op: str, task_id: str, task: Task | None = None):
+    """追加一条变更记录，op 为 "set" 或 "del"。"""
+    global _journal_file, _record_count
+    record = {"op": op, "task_id": task_id}
+    if task is not None:
+        record["task"] = encode_task(task)
+    if _journal_file is None:
+        _journal_file = open(JOURNAL_FILE, "a", encoding="utf-8")
+    # 不带缩进的 json 不含换行，一条记录恰好占一行
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    _journal_file.write(line + "\n")
+    _journal_file.flush()
+    _record_count += 1
+    if _record_count >= remind_config.remind_journal_compact_threshold:
+        _schedule_compaction()
+
+
+def replay_journal(tasks: dict) -> int:
+    """按写入顺序将日志重放到 tasks 上，返回重放的记录数。"""
+    count = 0
+    for path in (ROTATED_JOURNAL_FILE, JOURNAL_FILE):
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    if record["op"] == "set":
+                        tasks[record["task_id"]] = decode_task(record["task"])
+                    else:
+                        tasks.pop(record["task_id"], None)
+                except Exception as e:
+                    # 崩溃时最后一行可能只写了一半
+                    logger.warning(f"任务日志 {path.name} 第{lineno}行无效，已跳过: {e}")
+                    continue
+                count += 1
+    return count
+
+
+def has_journal() -> bool:
+    """是否存在尚未压缩的任务日志"""
+    return JOURNAL_FILE.exists() or ROTATED_JOURNAL_FILE.exists()
+
+
+def _rotate_journal() -> dict:
+    """关闭并轮换当前日志，返回此刻全部任务的浅拷贝。
+
+    必须在事件循环中调用：轮换与拷贝之间不会插入新的变更，
+    因此快照恰好包含轮换出去的日志里的全部记录。
+    """
+    global _journal_file, _record_count
+    if _journal_file is not None:
+        _journal_file.close()
+        _journal_file = None
+    if JOURNAL_FILE.exists():
+        if ROTATED_JOURNAL_FILE.exists():
+            # 上次压缩未完成，旧日志仍然需要保留
+            with open(ROTATED_JOURNAL_FILE, "a", encoding="utf-8") as dst, open(
+                JOURNAL_FILE, encoding="utf-8"
+            ) as src:
+                shutil.copyfileobj(src, dst)
+            JOURNAL_FILE.unlink()
+        else:
+            os.replace(JOURNAL_FILE, ROTATED_JOURNAL_FILE)
+    _record_count = 0
+    return dict(task_info)
+
+
+def _finish_compaction():
+    ROTATED_JOURNAL_FILE.unlink(missing_ok=True)
+    logger.info("任务日志已压缩为新的快照")
+
+
+async def compact_journal():
+    """立即压缩日志，用于启动载入完成时。"""
+    global _compaction
+    if _compaction is not None:
+        await _compaction
+    _compaction = asyncio.ensure_future(_compact_in_background())
+    await _compaction
+
+
+async def close_journal():
+    """等待后台压缩结束后做最后一次压缩，用于关闭时。"""
+    if _compaction is not None:
+        await _compaction
+    if not tasks_ready():
+        # 任务尚未载入完整，保留日志留待下次启动重放
+        return
+    write_tasks_file(_rotate_journal())
+    _finish_compaction()
+
+
+async def _compact_in_background():
+    global _compaction
+    try:
+        snapshot = _rotate_journal()
+        await asyncio.to_thread(write_tasks_file, snapshot)
+        _finish_compaction()
+    except Exception as e:
+        logger.error(f"压缩任务日志失败: {e}")
+    finally:
+        _compaction = None
+
+
+def _schedule_compaction():
+    global _compaction
+    # 载入完成前内存中的任务并不完整，不能用来生成快照
+    if _compaction is not None or not tasks_ready():
+        return
+    _compaction = asyncio.get_running_loop().create_task(_compact_in_background())
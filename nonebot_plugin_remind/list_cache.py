@@ -0,0 +1,101 @@
+"""提醒列表渲染结果缓存模块。
+
+提醒列表命令的输出按 (用户, 会话, 任务类型, 排序方式) 缓存，只在列表命令执行时才渲染。
+该用户在对应会话中的任务被添加、删除或到期移除时清除缓存；
+展示文本中含有群成员昵称，缓存超过 remind_nickname_ttl 秒或群成员变动时也会失效。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable
+from typing import Callable
+
+from .common import task_index, task_info
+from .config import remind_config
+from .lru import LRUCache
+from .model import Task, TaskType
+
+# (任务类型, 会话id, 是否按提醒时间排序)，私聊中的列表会话id为 None
+ListKey = tuple[TaskType, "int | None", bool]
+
+
+class RenderedListCache:
+    def __init__(self, maxsize: int, ttl: float):
+        """maxsize 为最多缓存列表的用户数"""
+        self._ttl = ttl
+        # 用户id → {ListKey: (渲染结果, 渲染时间)}
+        self._users: LRUCache[int, dict[ListKey, tuple[str, float]]] = LRUCache(
+            maxsize
+        )
+        # 每次失效时递增，渲染期间发生过失效的结果不写入缓存
+        self._version = 0
+
+    async def get(
+        self,
+        user_id: int,
+        key: ListKey,
+        render: Callable[[], Awaitable[str]],
+    ) -> str:
+        """返回缓存的列表文本，没有缓存或已过期时调用 render 渲染"""
+        entries = self._users.get(user_id)
+        if entries is not None and key in entries:
+            text, rendered_at = entries[key]
+            if time.monotonic() - rendered_at <= self._ttl:
+                return text
+        version = self._version
+        text = await render()
+        if version == self._version and self._users.maxsize > 0:
+            entries = self._users.get(user_id)
+            if entries is None:
+                entries = {}
+                self._users.put(user_id, entries)
+            entries[key] = (text, time.monotonic())
+        return text
+
+    def invalidate_task(self, task: Task):
+        """任务被添加或移除时清除包含该任务的列表"""
+        self._version += 1
+        entries = self._users.pop(task.reminder_user_id)
+        if not entries:
+            return
+        # 私聊中的列表包含全部会话的任务，或仅包含私聊任务
+        private = remind_config.private_list_all or not task.is_group
+        remaining = {
+            key: value
+            for key, value in entries.items()
+            if key[0] is not task.type
+            or not (key[1] == task.group_id or (key[1] is None and private))
+        }
+        if remaining:
+            self._users.put(task.reminder_user_id, remaining)
+
+    def invalidate_group(self, group_id: int):
+        """群成员变动时清除可能包含该群成员昵称的列表
+
+        只有在该群中设置过提醒的用户，其列表中才会出现该群成员的昵称。
+        """
+        self._version += 1
+        user_ids = {
+            task_info[task_id].reminder_user_id
+            for task_id in task_index.group_task_ids(group_id)
+        }
+        for user_id in user_ids:
+            entries = self._users.pop(user_id)
+            if not entries:
+                continue
+            remaining = {
+                key: value
+                for key, value in entries.items()
+                if not (
+                    key[1] == group_id
+                    or (key[1] is None and remind_config.private_list_all)
+                )
+            }
+            if remaining:
+                self._users.put(user_id, remaining)
+
+
+list_cache = RenderedListCache(
+    remind_config.remind_list_cache_size, remind_config.remind_nickname_ttl
+)
@@ -0,0 +1,73 @@
+"""启动时的任务载入模块。
+
+在线程中逐批读取并解码本地保存的任务，每解码完一批就在事件循环中注册这一批的定时任务，
+机器人无需等待全部任务载入即可启动。载入完成前列表和删除命令会提示稍后再试。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from nonebot.log import logger
+
+from .catchup import start_catch_up
+from .common import set_tasks_ready, task_info
+from .data_sourse import schedule_task
+from .model import Task, TaskType
+from .storage import iter_stored_task_batches, rewrite_storage
+from .utils import add_task
+
+# 每批解码并注册的任务数
+LOAD_BATCH_SIZE = 500
+
+
+def _restore_task(task: Task, current_time: datetime) -> bool:
+    """恢复单个任务，返回任务是否已经过时
+
+    过时的单次提醒只登记不定时，载入完成后交给补发模块按顺序补发。
+    """
+    expired = task.type is TaskType.DATETIME and task.remind_time <= current_time
+    if not expired:
+        schedule_task(task)
+    add_task(task)
+    return expired
+
+
+async def load_tasks_in_background():
+    """分批载入全部任务，完成后标记为就绪"""
+    total_tasks = 0
+    expired_tasks: list[Task] = []
+    batches = iter_stored_task_batches(LOAD_BATCH_SIZE)
+    try:
+        while True:
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            current_time = datetime.now()
+            for task in batch:
+                # 载入期间新设置的任务已经注册过，日志中也可能读到它们
+                if task.task_id in task_info:
+                    continue
+                if _restore_task(task, current_time):
+                    expired_tasks.append(task)
+                else:
+                    total_tasks += 1
+            # 让出事件循环，处理载入期间到来的消息
+            await asyncio.sleep(0)
+    except Exception as e:
+        # 不标记就绪，避免用不完整的任务覆盖本地数据
+        logger.opt(exception=e).error(f"载入提醒任务失败: {e}")
+        return
+
+    # 先登记待补发的任务，就绪后删除命令才能取消这些过时提醒
+    start_catch_up(expired_tasks)
+    set_tasks_ready()
+    # 输出信息
+    if expired_tasks:
+        info = f"已载入 {total_tasks} 个任务，另有 {len(expired_tasks)} 个过时任务待补发"
+        logger.warning(info)
+    else:
+        info = f"全部 {total_tasks} 个定时任务均已载入完成！"
+        logger.success(info)
+    await rewrite_storage()
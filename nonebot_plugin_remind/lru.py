@@ -0,0 +1,70 @@
+"""带命中统计的 LRU 缓存。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int):
+        """maxsize 不大于 0 时不缓存任何内容"""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default=None, valid: Callable[[V], bool] | None = None):
+        """查询缓存并计入命中统计，命中时将该项标记为最近使用
+
+        valid 判断缓存项是否仍然有效，无效的缓存项会被移除并计为未命中。
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if valid is not None and not valid(value):
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default=None):
+        return self._data.pop(key, default)
+
+    def items(self) -> list[tuple[K, V]]:
+        """按从最久未使用到最近使用的顺序返回全部缓存项"""
+        return list(self._data.items())
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,6 +1,7 @@
 """数据文件迁移模块。
 
-在 load_tasks() 中调用，将旧版数据格式升级到当前版本。
+在解码旧版 jsonpickle 任务数据时调用，将旧版任务字典升级到当前版本，
+之后再转换为 Task。
 """
 
 import re
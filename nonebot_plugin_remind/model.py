@@ -0,0 +1,63 @@
+"""提醒任务数据模型。"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+from apscheduler.triggers.cron import CronTrigger
+from nonebot.adapters.onebot.v11 import Message
+
+
+class TaskType(str, Enum):
+    """任务类型，取值与旧版数据文件中的 type 字段一致"""
+
+    DATETIME = "datetime"
+    CRON = "CronTrigger"
+
+
+@dataclass
+class Task:
+    """单个提醒任务
+
+    使用 __slots__ 去掉每个实例的 __dict__，大量任务时节省内存并加快属性访问。
+    """
+
+    __slots__ = (
+        "task_id",
+        "reminder_user_id",
+        "user_ids",
+        "type",
+        "remind_time",
+        "reminder_message",
+        "is_group",
+        "group_id",
+    )
+
+    task_id: str
+    # 设置提醒的用户
+    reminder_user_id: int
+    # 被提醒人的 at 消息段
+    user_ids: Message
+    type: TaskType
+    # 单次提醒为 datetime，循环提醒为 CronTrigger
+    remind_time: datetime | CronTrigger
+    reminder_message: Message
+    is_group: bool
+    # 群聊为群号，私聊为用户 id
+    group_id: int
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Task:
+        """由旧版任务字典构造，字典需已经过 migration 迁移"""
+        return cls(
+            task_id=data["task_id"],
+            reminder_user_id=int(data["reminder_user_id"]),
+            user_ids=data["user_ids"],
+            type=TaskType(data["type"]),
+            remind_time=data["remind_time"],
+            reminder_message=data["reminder_message"],
+            is_group=bool(data["is_group"]),
+            group_id=int(data["group_id"]),
+        )
@@ -0,0 +1,120 @@
+"""群成员昵称缓存模块。
+
+列表和删除命令展示被 at 的人时需要查询群昵称。按群缓存查询结果，
+在 remind_nickname_ttl 秒内重复查询不再调用接口，缓存的群数超过
+remind_nickname_cache_groups 时淘汰最久未使用的群。同一群（或同一成员）
+同时只发起一次接口调用，其余查询等待这次调用的结果。
+群成员增加、减少和群名片变更时使对应缓存失效。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+
+import nonebot
+from nonebot.log import logger
+
+from .config import remind_config
+
+UNKNOWN_NAME = "未知用户"
+
+
+def _display_name(member: dict) -> str:
+    return member.get("card") or member.get("nickname") or str(member["user_id"])
+
+
+class _GroupMembers:
+    __slots__ = ("names", "list_expires")
+
+    def __init__(self):
+        # 用户id → (昵称, 过期时间)
+        self.names: dict[int, tuple[str, float]] = {}
+        # 完整成员列表的过期时间，0 表示未取得完整列表
+        self.list_expires = 0.0
+
+
+class MemberNicknameCache:
+    def __init__(self):
+        self._groups: OrderedDict[int, _GroupMembers] = OrderedDict()
+        # 进行中的接口调用，键为群号（成员列表）或 (群号, 用户id)（单个成员）
+        self._inflight: dict[int | tuple[int, int], asyncio.Future] = {}
+
+    def _group(self, group_id: int) -> _GroupMembers:
+        members = self._groups.get(group_id)
+        if members is None:
+            members = _GroupMembers()
+            self._groups[group_id] = members
+            max_groups = max(remind_config.remind_nickname_cache_groups, 1)
+            while len(self._groups) > max_groups:
+                self._groups.popitem(last=False)
+        else:
+            self._groups.move_to_end(group_id)
+        return members
+
+    async def get(self, group_id: int, user_id: int) -> str:
+        """获取群成员昵称，获取失败时返回"未知用户" """
+        now = time.monotonic()
+        members = self._group(group_id)
+        cached = members.names.get(user_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        use_info = remind_config.remind_nickname_lookup == "info"
+        if not use_info and members.list_expires > now:
+            return UNKNOWN_NAME
+        try:
+            if use_info:
+                return await self._single_flight(
+                    (group_id, user_id), self._fetch_member, group_id, user_id
+                )
+            await self._single_flight(group_id, self._fetch_list, group_id)
+        except Exception as e:
+            logger.error(f"获取用户昵称失败: {e}")
+            return UNKNOWN_NAME
+        cached = self._group(group_id).names.get(user_id)
+        return cached[0] if cached is not None else UNKNOWN_NAME
+
+    async def _single_flight(self, key, fetch, *args):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch(*args))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch_list(self, group_id: int):
+        bot = nonebot.get_bot()
+        result = await bot.call_api("get_group_member_list", group_id=group_id)
+        expires = time.monotonic() + remind_config.remind_nickname_ttl
+        members = self._group(group_id)
+        members.names = {
+            int(member["user_id"]): (_display_name(member), expires)
+            for member in result
+        }
+        members.list_expires = expires
+
+    async def _fetch_member(self, group_id: int, user_id: int) -> str:
+        bot = nonebot.get_bot()
+        member = await bot.call_api(
+            "get_group_member_info", group_id=group_id, user_id=user_id
+        )
+        name = _display_name(member)
+        expires = time.monotonic() + remind_config.remind_nickname_ttl
+        self._group(group_id).names[user_id] = (name, expires)
+        return name
+
+    def invalidate(self, group_id: int, user_id: int | None = None):
+        """使群成员缓存失效，user_id 为 None 时清除整个群"""
+        members = self._groups.get(group_id)
+        if members is None:
+            return
+        if user_id is None:
+            del self._groups[group_id]
+            return
+        members.names.pop(user_id, None)
+        # 成员变动后完整列表不再准确
+        members.list_expires = 0.0
+
+
+nickname_cache = MemberNicknameCache()
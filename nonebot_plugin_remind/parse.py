@@ -1,33 +1,73 @@
 """中文自然语言时间解析模块。
 
 使用 jionlp 离线解析中文时间表达式，GLM-4 作为可选兜底。
+jionlp 导入较慢，在首次使用时才导入，启动后由 warm_up_jionlp 在后台线程中预先加载。
 """
 
 from __future__ import annotations
 
 import ast
-import os
-import sys
+import contextlib
+import io
+import re
+import threading
 import time as _time
+import unicodedata
 from datetime import datetime, timedelta
 
-# jionlp 在 import 时会 print 推广信息，屏蔽 stdout
-_devnull = open(os.devnull, "w")
-_stdout = sys.stdout
-sys.stdout = _devnull
-try:
-    import jionlp as jio
-finally:
-    sys.stdout = _stdout
-    _devnull.close()
-
 from apscheduler.triggers.cron import CronTrigger
 from nonebot.log import logger
 
+from .config import remind_config
+from .fastpath import fast_parse_time
+from .glm_cache import glm_cache
 from .glm4 import parsed_cron_time_glm4, parsed_datetime_glm4
+from .lru import LRUCache
 
 _DATETIME_FMT = "%Y-%m-%d %H:%M:%S"
 
+# jionlp 解析结果缓存，键为 (规范化文本, 日期)
+_jionlp_cache: LRUCache[tuple[str, object], tuple] = LRUCache(
+    remind_config.remind_parse_cache_size
+)
+# 未命中过一次的缓存键，第二次未命中时才探测并缓存，只出现一次的文本不必多解析一次
+_jionlp_seen: LRUCache[tuple[str, object], bool] = LRUCache(
+    remind_config.remind_parse_cache_size
+)
+# 探测结果是否依赖当前时刻的第二个时间基准的偏移秒数
+_PROBE_SHIFT = 3607
+_WHITESPACE = re.compile(r"\s+")
+# 可能以当前时刻为基准的说法，GLM-4 结果按分钟锚定缓存，其余按日期锚定
+_RELATIVE_HINT = re.compile(r"后|内|过|再|等|还有|之后|以后")
+# 模型调用出错时的回复，不缓存
+_GLM_ERRORS = ("Error", "Failed", "Timeout", "Unavailable")
+
+_jio = None
+_jio_lock = threading.Lock()
+
+
+def _jionlp():
+    """导入并返回 jionlp 模块，只在首次调用时导入"""
+    global _jio
+    if _jio is None:
+        with _jio_lock:
+            if _jio is None:
+                # jionlp 在 import 时会 print 推广信息，屏蔽 stdout
+                with contextlib.redirect_stdout(io.StringIO()):
+                    import jionlp
+
+                _jio = jionlp
+    return _jio
+
+
+def warm_up_jionlp():
+    """导入 jionlp 并解析一次样例，加载其内部词典，在后台线程中调用"""
+    start = _time.perf_counter()
+    jio = _jionlp()
+    jio.parse_time("明天8点", time_base=_time.time())
+    jio.ner.extract_time("明天8点开会", time_base=_time.time())
+    logger.info(f"jionlp 预加载完成，用时 {_time.perf_counter() - start:.2f} 秒")
+
 
 # ── 公开接口 ────────────────────────────────────────────────
 
@@ -80,7 +120,7 @@ async def extract_time_and_message(
 
     # 使用 jio.ner.extract_time 获取带位置信息的时间实体
     try:
-        entities = jio.ner.extract_time(text, time_base=_time.time())
+        entities = _jionlp().ner.extract_time(text, time_base=_time.time())
     except Exception as e:
         logger.debug(f"jionlp extract_time 异常: {e}")
         return None, text
@@ -95,8 +135,13 @@ async def extract_time_and_message(
     time_text = entity["text"]
     offset = entity["offset"]  # [start, end]
 
-    # 解析时间
-    parsed = await parse_time(time_text)
+    # extract_time 已经解析过实体，直接转换其结果，转换失败时再完整解析
+    detail = entity.get("detail")
+    parsed = _convert_jionlp_result(detail) if isinstance(detail, dict) else None
+    if parsed is not None:
+        logger.info(f'jionlp 解析: "{time_text}" → {parsed}')
+    else:
+        parsed = await parse_time(time_text)
     if parsed is None:
         return None, text
 
@@ -105,20 +150,106 @@ async def extract_time_and_message(
     return parsed, remaining
 
 
+def parse_cache_stats() -> dict:
+    """jionlp 解析缓存的命中统计"""
+    return _jionlp_cache.stats()
+
+
 # ── jionlp 解析 ─────────────────────────────────────────────
 
 
-def _parse_with_jionlp(text: str) -> datetime | CronTrigger | None:
-    """使用 jionlp 解析时间表达式。"""
+def _normalize(text: str) -> str:
+    """全角转半角并合并空白，作为缓存键和实际解析的文本"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _jionlp_parse(text: str, time_base: int) -> dict | None:
     try:
-        result = jio.parse_time(text, time_base=_time.time())
+        return _jionlp().parse_time(text, time_base=time_base)
     except Exception as e:
         logger.debug(f"jionlp 解析异常: {e}")
         return None
 
+
+def _start_time(result: dict) -> datetime | None:
+    if result.get("type") not in ("time_point", "time_span"):
+        return None
+    return _parse_timestamp(result.get("time"))
+
+
+def _cache_entry(text: str, time_base: int, result: dict | None) -> tuple | None:
+    """生成缓存项，结果依赖当前时刻而又无法换算时返回 None（不缓存）
+
+    用同一天内相差 _PROBE_SHIFT 秒的另一个时间基准再解析一次：
+    两次结果相同说明只依赖日期，原样缓存；
+    起始时间恰好相差 _PROBE_SHIFT 秒说明是"半小时后"这类相对时间，
+    缓存与时间基准的差值，命中时再加到当前时刻上。
+    """
+    if result is None:
+        return ("fixed", None)
+    base = datetime.fromtimestamp(time_base)
+    shift = _PROBE_SHIFT if base.hour < 12 else -_PROBE_SHIFT
+    probe = _jionlp_parse(text, time_base + shift)
+    if probe is None:
+        return None
+    if probe == result:
+        return ("fixed", result)
+    start = _start_time(result)
+    probe_start = _start_time(probe)
+    if (
+        start is not None
+        and probe_start is not None
+        and probe["type"] == result["type"]
+        and probe_start - start == timedelta(seconds=shift)
+    ):
+        return ("relative", result["type"], start - base)
+    return None
+
+
+def _cached_jionlp_parse(text: str, time_base: int) -> dict | None:
+    """带缓存的 jio.parse_time，text 需已规范化，缓存项不会返回基于过期时间基准计算的结果"""
+    base = datetime.fromtimestamp(time_base)
+    key = (text, base.date())
+    entry = _jionlp_cache.get(key)
+    if entry is None:
+        result = _jionlp_parse(text, time_base)
+        # 无法解析的结果不需要探测，直接缓存
+        if result is not None and _jionlp_seen.pop(key) is None:
+            _jionlp_seen.put(key, True)
+            return result
+        entry = _cache_entry(text, time_base, result)
+        if entry is not None:
+            _jionlp_cache.put(key, entry)
+        return result
+    if entry[0] == "fixed":
+        return entry[1]
+    # 相对时间以当前时刻重新定位，只有起始时间会被使用
+    start = (base + entry[2]).strftime(_DATETIME_FMT)
+    return {"type": entry[1], "time": [start, start]}
+
+
+def _parse_with_jionlp(text: str) -> datetime | CronTrigger | None:
+    """使用 jionlp 解析时间表达式，常见格式先尝试快速解析。"""
+    normalized = _normalize(text)
+    time_base = int(_time.time())
+    if remind_config.remind_fast_parse:
+        parsed = fast_parse_time(normalized, datetime.fromtimestamp(time_base))
+        if parsed is not None:
+            logger.info(f'快速解析: "{text}" → {parsed}')
+            return parsed
+
+    result = _cached_jionlp_parse(normalized, time_base)
     if result is None:
         return None
 
+    parsed = _convert_jionlp_result(result)
+    if parsed is not None:
+        logger.info(f'jionlp 解析: "{text}" → {parsed}')
+    return parsed
+
+
+def _convert_jionlp_result(result: dict) -> datetime | CronTrigger | None:
+    """将 jio.parse_time 的结果（或 ner 实体的 detail）转换为 datetime / CronTrigger。"""
     time_type = result.get("type")
     time_data = result.get("time")
     logger.debug(f"jionlp 原始结果: type={time_type}, time={time_data}")
@@ -137,10 +268,7 @@ def _parse_with_jionlp(text: str) -> datetime | CronTrigger | None:
         logger.warning(f"不支持的 jionlp 时间类型: {time_type}")
         return None
 
-    parsed = converter(time_data)
-    if parsed is not None:
-        logger.info(f'jionlp 解析: "{text}" → {parsed}')
-    return parsed
+    return converter(time_data)
 
 
 # ── 类型转换 ─────────────────────────────────────────────────
@@ -262,25 +390,57 @@ def _build_cron_params(delta: dict, pt: datetime) -> dict:
 
 
 async def _parse_date_with_glm4(text: str) -> datetime | None:
-    """GLM-4 解析单次提醒时间。"""
+    """GLM-4 解析单次提醒时间，结果按 (文本, 锚定时间) 缓存"""
+    key_text = _normalize(text)
+    now = datetime.now()
+    anchor = now.strftime(
+        "%Y-%m-%d %H:%M" if _RELATIVE_HINT.search(key_text) else "%Y-%m-%d"
+    )
+    res = glm_cache.get("date", key_text, anchor)
+    if res is not None:
+        result = _parse_glm_datetime(res)
+        # 按日期锚定的结果在当天晚些时候可能已经过去，此时重新询问模型
+        if result is None or result >= now.replace(second=0, microsecond=0):
+            logger.info(f'GLM-4 解析单次提醒（缓存）: "{text}" -> {res}')
+            return result
+
     logger.info(f'GLM-4 解析单次提醒: "{text}"')
     res = await parsed_datetime_glm4(text)
-    if isinstance(res, str) and res not in ("None", "Error", "Failed", "Timeout"):
-        try:
-            return datetime.strptime(res, "%Y-%m-%d %H:%M")
-        except ValueError:
-            pass
-    return None
+    if not isinstance(res, str) or res in _GLM_ERRORS:
+        return None
+    result = _parse_glm_datetime(res)
+    await glm_cache.put("date", key_text, res, anchor, negative=result is None)
+    return result
+
+
+def _parse_glm_datetime(res: str) -> datetime | None:
+    try:
+        return datetime.strptime(res, "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
 
 
 async def _parse_cron_with_glm4(text: str) -> CronTrigger | None:
-    """GLM-4 解析循环提醒时间。"""
-    logger.info(f'GLM-4 解析循环提醒: "{text}"')
-    params_str = await parsed_cron_time_glm4(text)
+    """GLM-4 解析循环提醒时间，结果只与文本有关，按文本缓存"""
+    key_text = _normalize(text)
+    params_str = glm_cache.get("cron", key_text)
+    cached = params_str is not None
+    if cached:
+        logger.info(f'GLM-4 解析循环提醒（缓存）: "{text}" -> {params_str}')
+    else:
+        logger.info(f'GLM-4 解析循环提醒: "{text}"')
+        params_str = await parsed_cron_time_glm4(text)
+    trigger = _build_cron_trigger(params_str)
+    if not cached and isinstance(params_str, str) and params_str not in _GLM_ERRORS:
+        await glm_cache.put("cron", key_text, params_str, negative=trigger is None)
+    return trigger
+
+
+def _build_cron_trigger(params_str) -> CronTrigger | None:
     try:
         params = ast.literal_eval(params_str)
         if isinstance(params, dict):
             return CronTrigger(**params)
-    except (ValueError, SyntaxError):
+    except (ValueError, SyntaxError, TypeError):
         pass
     return None
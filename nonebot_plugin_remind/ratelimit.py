@@ -0,0 +1,113 @@
+"""提醒发送限流模块。
+
+所有提醒消息的发送都要先后取得全局令牌桶和所在会话令牌桶的令牌，
+令牌按先来先得的顺序发放，既限制了发送速率又保持了提醒的先后顺序。
+同时限制同时进行中的发送接口调用数，并为每次调用设置超时。
+超时的调用可能已经被协议端执行，因此以 SendTimeoutError 与一般的发送失败相区分，
+调用方不应再重发。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+# 会话令牌桶数量超过该值时清理已经回满的桶
+_MAX_IDLE_BUCKETS = 1024
+
+
+class SendTimeoutError(Exception):
+    """发送接口调用超时，消息可能已经送达"""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """rate 为每秒补充的令牌数，不大于 0 时不限流"""
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # 惰性创建，确保绑定到运行中的事件循环
+        self._lock: asyncio.Lock | None = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def is_full(self) -> bool:
+        self._refill()
+        return self._tokens >= self.capacity
+
+    async def acquire(self):
+        """取得一个令牌，asyncio.Lock 保证等待者按先后顺序获得令牌"""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SendLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        chat_rate: float,
+        chat_burst: int,
+        concurrency: int,
+        timeout: float,
+    ):
+        self._global = TokenBucket(rate, burst)
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._chats: dict[tuple[str, int], TokenBucket] = {}
+        self._concurrency = concurrency
+        self._inflight: asyncio.Semaphore | None = None
+        self._timeout = timeout
+
+    def _chat_bucket(self, chat: tuple[str, int]) -> TokenBucket:
+        bucket = self._chats.get(chat)
+        if bucket is None:
+            if len(self._chats) >= _MAX_IDLE_BUCKETS:
+                self._chats = {k: b for k, b in self._chats.items() if not b.is_full}
+            bucket = TokenBucket(self._chat_rate, self._chat_burst)
+            self._chats[chat] = bucket
+        return bucket
+
+    async def call(self, chat: tuple[str, int], api: Callable[[], Awaitable[T]]) -> T:
+        """限流后调用发送接口
+
+        参数：
+            chat:tuple 会话标识，如 ("group", 群号) 或 ("private", 用户id)
+            api:Callable 返回发送接口协程的函数
+
+        调用超时时抛出 SendTimeoutError。
+        """
+        # 先等会话令牌再等全局令牌，避免拿着全局令牌空等
+        await self._chat_bucket(chat).acquire()
+        await self._global.acquire()
+        if self._inflight is None:
+            self._inflight = asyncio.Semaphore(max(self._concurrency, 1))
+        async with self._inflight:
+            if self._timeout <= 0:
+                return await api()
+            try:
+                return await asyncio.wait_for(api(), self._timeout)
+            except asyncio.TimeoutError as e:
+                raise SendTimeoutError(
+                    f"发送接口 {self._timeout} 秒内未返回，消息可能已经送达"
+                ) from e
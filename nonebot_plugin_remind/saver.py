@@ -0,0 +1,69 @@
+"""延迟合并写入模块。
+
+json 模式下任务变更只标记为待保存，由后台任务在 remind_save_delay
+秒内合并所有变更后统一写入一次，编码和写文件都在线程中完成，不阻塞事件循环。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+from nonebot.log import logger
+
+from .common import TASKS_FILE, task_info, tasks_ready
+from .config import remind_config
+from .utils import save_tasks_to_file, write_tasks_file
+
+_dirty_count = 0
+_save_task: asyncio.Task | None = None
+
+
+def mark_dirty():
+    """标记任务已变更，等待后台合并保存"""
+    global _dirty_count, _save_task
+    if remind_config.remind_save_delay <= 0:
+        if tasks_ready():
+            save_tasks_to_file()
+        return
+    _dirty_count += 1
+    if _save_task is None:
+        _save_task = asyncio.get_running_loop().create_task(_write_behind())
+
+
+async def _write_behind():
+    global _dirty_count, _save_task
+    try:
+        await asyncio.sleep(remind_config.remind_save_delay)
+        if not tasks_ready():
+            # 载入完成后会整体重写一次，其间的变更无需单独保存
+            return
+        while _dirty_count:
+            merged, _dirty_count = _dirty_count, 0
+            # 任务创建后不会被原地修改，浅拷贝即为一致的快照，
+            # 之后事件循环中的增删不会影响线程中正在编码的数据
+            snapshot = dict(task_info)
+            try:
+                await asyncio.to_thread(write_tasks_file, snapshot)
+            except Exception as e:
+                # 保留待保存状态，下次变更或关闭时重试
+                _dirty_count += merged
+                logger.error(f"保存提醒任务文件失败: {e}")
+                break
+            logger.info(f"提醒任务文件已保存到 {TASKS_FILE}（合并 {merged} 次变更）")
+    finally:
+        _save_task = None
+
+
+async def flush_saver():
+    """立即写入尚未保存的变更，用于关闭时"""
+    global _dirty_count
+    pending = tasks_ready() and (_save_task is not None or _dirty_count > 0)
+    if _save_task is not None:
+        _save_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _save_task
+    if pending:
+        # 写入锁保证与被取消前已进入线程的写入不会交错
+        _dirty_count = 0
+        save_tasks_to_file()
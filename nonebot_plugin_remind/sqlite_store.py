@@ -0,0 +1,185 @@
+"""SQLite 任务存储模块。
+
+sqlite 模式下每个任务单独存为一行，新增/删除只需写入对应的行；
+提醒列表和删除命令通过 (reminder_user_id, group_id, type, remind_time)
+索引直接查出当前用户的任务ID，无需遍历全部任务。
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import closing
+
+from nonebot.log import logger
+
+from .codec import FORMAT_VERSION, decode_task, encode_task
+from .common import DB_FILE
+from .model import Task, TaskType
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    reminder_user_id TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    remind_time REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user
+    ON tasks (reminder_user_id, group_id, type, remind_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# 保留原有 rowid，使按设置顺序排序的结果不受更新影响
+_UPSERT = """
+INSERT INTO tasks (task_id, reminder_user_id, group_id, type, remind_time, data)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (task_id) DO UPDATE SET
+    reminder_user_id = excluded.reminder_user_id,
+    group_id = excluded.group_id,
+    type = excluded.type,
+    remind_time = excluded.remind_time,
+    data = excluded.data
+"""
+
+_conn: sqlite3.Connection | None = None
+# 启动载入在线程中进行，连接需要在线程间共享
+_lock = threading.RLock()
+# 载入时读到的旧版格式行的任务ID，载入完成后改写为当前格式
+_legacy_ids: set[str] = set()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def _to_row(task: Task) -> tuple:
+    is_date = task.type is TaskType.DATETIME
+    return (
+        task.task_id,
+        str(task.reminder_user_id),
+        task.group_id,
+        task.type.value,
+        task.remind_time.timestamp() if is_date else None,
+        json.dumps(encode_task(task), ensure_ascii=False),
+    )
+
+
+def is_imported() -> bool:
+    """是否已从旧版任务文件导入过数据"""
+    with _lock:
+        row = (
+            _get_conn()
+            .execute("SELECT value FROM meta WHERE key = 'imported'")
+            .fetchone()
+        )
+    return row is not None
+
+
+def import_tasks(tasks: dict):
+    """一次性导入旧版任务文件中的全部任务"""
+    rows = [_to_row(task) for task in tasks.values()]
+    with _lock, _get_conn() as conn:
+        conn.executemany(_UPSERT, rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('imported', '1')"
+        )
+    logger.success(f"已将 {len(tasks)} 个任务导入 SQLite 数据库 {DB_FILE}")
+
+
+def iter_task_batches(batch_size: int) -> Iterator[list[Task]]:
+    """按设置顺序分批读出全部任务
+
+    使用独立的只读连接，逐批读取期间不会阻塞其他写入。
+    """
+    with closing(sqlite3.connect(DB_FILE)) as conn:
+        cursor = conn.execute("SELECT data FROM tasks ORDER BY rowid")
+        while rows := cursor.fetchmany(batch_size):
+            batch = []
+            for (data,) in rows:
+                task = decode_task(raw := json.loads(data))
+                if raw.get("v") != FORMAT_VERSION:
+                    _legacy_ids.add(task.task_id)
+                batch.append(task)
+            yield batch
+
+
+def upsert_task(task: Task):
+    row = _to_row(task)
+    with _lock, _get_conn() as conn:
+        conn.execute(_UPSERT, row)
+
+
+def delete_tasks(task_ids: tuple[str, ...] | list[str]):
+    with _lock, _get_conn() as conn:
+        conn.executemany(
+            "DELETE FROM tasks WHERE task_id = ?", [(tid,) for tid in task_ids]
+        )
+
+
+def upgrade_legacy_rows(tasks: dict) -> int:
+    """把载入时读到的旧版格式行改写为当前格式，返回改写的行数
+
+    tasks 为事件循环中正在使用的任务字典，在持有锁时才读取：
+    其间事件循环中的写入和删除会等待锁，已被移除的任务不会被写回。
+    """
+    with _lock, _get_conn() as conn:
+        rows = [
+            _to_row(task)
+            for task_id in _legacy_ids
+            if (task := tasks.get(task_id)) is not None
+        ]
+        conn.executemany(_UPSERT, rows)
+        _legacy_ids.clear()
+    return len(rows)
+
+
+def query_task_ids(
+    user_id: int,
+    group_id: int | None,
+    task_type: str,
+    *,
+    sort: bool,
+    private_list_all: bool,
+) -> list[str]:
+    """查询用户在当前会话中的任务ID
+
+    参数：
+        user_id:int 提醒人用户id
+        group_id:int 群聊id, 私聊为None
+        task_type:str "datetime" 或 "CronTrigger"
+        sort:bool 是否按提醒时间排序，否则按设置顺序
+        private_list_all:bool 私聊时是否列出全部会话的任务
+    """
+    sql = "SELECT task_id FROM tasks WHERE reminder_user_id = ?"
+    params: list = [str(user_id)]
+    if group_id is not None:
+        sql += " AND group_id = ?"
+        params.append(group_id)
+    elif not private_list_all:
+        # 私聊提醒的 group_id 即为用户 id
+        sql += " AND group_id = ?"
+        params.append(int(user_id))
+    sql += " AND type = ?"
+    params.append(task_type)
+    sql += " ORDER BY remind_time, rowid" if sort else " ORDER BY rowid"
+    with _lock:
+        return [row[0] for row in _get_conn().execute(sql, params)]
+
+
+def close_db():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
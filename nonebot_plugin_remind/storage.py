@@ -0,0 +1,124 @@
+"""任务持久化调度模块。
+
+根据 remind_storage 配置，将任务的变更写入对应的存储方式。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+
+from nonebot.log import logger
+
+from .codec import decode_tasks, iter_task_batches
+from .common import TASKS_FILE, task_info
+from .config import remind_config
+from .journal import (
+    append_record,
+    close_journal,
+    compact_journal,
+    has_journal,
+    replay_journal,
+)
+from .saver import flush_saver, mark_dirty
+from .sqlite_store import (
+    close_db,
+    delete_tasks,
+    import_tasks,
+    is_imported,
+    iter_task_batches as iter_db_task_batches,
+    upgrade_legacy_rows,
+    upsert_task,
+)
+from .model import Task
+
+
+def _use_journal() -> bool:
+    return remind_config.remind_storage == "journal"
+
+
+def _use_sqlite() -> bool:
+    return remind_config.remind_storage == "sqlite"
+
+
+def iter_stored_task_batches(batch_size: int) -> Iterator[list[Task]]:
+    """逐批读取本地保存的全部任务
+
+    每一批的读取和解码都较慢，应在线程中调用 next()。
+    """
+    if _use_sqlite():
+        if not is_imported():
+            # 首次启用 sqlite 时导入旧版任务文件
+            import_tasks(_load_task_file() or {})
+        yield from iter_db_task_batches(batch_size)
+        return
+    if has_journal():
+        # 日志中的删除记录可能作用于快照里的任意任务，需整体重放后再分批
+        tasks = list((_load_task_file() or {}).values())
+        for start in range(0, len(tasks), batch_size):
+            yield tasks[start : start + batch_size]
+        return
+    if TASKS_FILE.exists():
+        with open(TASKS_FILE, encoding="utf-8") as f:
+            text = f.read()
+        yield from iter_task_batches(text, batch_size)
+
+
+def _load_task_file() -> dict | None:
+    if not TASKS_FILE.exists() and not has_journal():
+        return None
+    tasks = {}
+    if TASKS_FILE.exists():
+        with open(TASKS_FILE, encoding="utf-8") as f:
+            tasks.update(decode_tasks(f.read()))
+    # 即使当前配置为 json，也要重放切换配置前遗留的日志
+    replay_journal(tasks)
+    return tasks
+
+
+def persist_task(task_id: str):
+    """持久化单个任务的新增或变更"""
+    if _use_sqlite():
+        upsert_task(task_info[task_id])
+    elif _use_journal():
+        append_record("set", task_id, task_info[task_id])
+    else:
+        mark_dirty()
+
+
+def persist_task_removal(*task_ids: str):
+    """持久化任务的删除"""
+    if _use_sqlite():
+        delete_tasks(task_ids)
+    elif _use_journal():
+        for task_id in task_ids:
+            append_record("del", task_id)
+    else:
+        mark_dirty()
+
+
+async def rewrite_storage():
+    """启动载入完成后整理本地存储：压缩日志、改写旧版格式的行或重新保存任务文件。
+
+    此时已开始接受新的任务变更，重写不能覆盖这些变更。
+    """
+    if _use_journal() or has_journal():
+        await compact_journal()
+    elif _use_sqlite():
+        # 每行单独保存，只需改写仍为旧版格式的行
+        count = await asyncio.to_thread(upgrade_legacy_rows, task_info)
+        if count:
+            logger.info(f"已将 {count} 个旧版格式的任务改写为当前格式")
+    else:
+        # 交给延迟写入，与其他变更的保存共用同一个写入者，不会用旧快照覆盖新文件
+        mark_dirty()
+
+
+async def flush_storage():
+    """关闭前落盘尚未压缩的变更"""
+    if _use_sqlite():
+        close_db()
+    elif _use_journal():
+        await close_journal()
+    else:
+        await flush_saver()
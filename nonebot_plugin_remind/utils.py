@@ -1,50 +1,69 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
+import threading
 from datetime import timedelta
 
-import jsonpickle
-import nonebot
 from nonebot.adapters.onebot.v11 import Message
 from nonebot.log import logger
 
-from .common import TASKS_FILE, task_info
+from .codec import encode_tasks
+from .common import TASKS_FILE, task_index, task_info
 from .config import remind_config
+from .list_cache import list_cache
+from .model import Task, TaskType
+from .nickname import nickname_cache
+from .sqlite_store import query_task_ids
 
 
-# 自定义 JSON 编码器
-class CustomJSONEncoder(json.JSONEncoder):
-    def __init__(self, **kwargs):
-        kwargs["ensure_ascii"] = False
-        super().__init__(**kwargs)
+# 并发渲染任务列表时同时进行的昵称查询数
+RENDER_CONCURRENCY = 8
 
+# 后台线程与事件循环可能同时写入任务文件
+_write_lock = threading.Lock()
 
-# 设置 jsonpickle 使用自定义编码器
-jsonpickle.set_encoder_options("json", cls=CustomJSONEncoder)
+
+def write_tasks_file(tasks: dict):
+    """
+    将任务字典编码后写入本地文件
+
+    先写入临时文件再替换，避免写入中途崩溃导致任务文件损坏
+    """
+    tmp_file = TASKS_FILE.with_name(TASKS_FILE.name + ".tmp")
+    with _write_lock:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(encode_tasks(tasks))
+        os.replace(tmp_file, TASKS_FILE)
 
 
 def save_tasks_to_file():
     """
     将当前提醒任务保存到本地文件
     """
-    with open(TASKS_FILE, "w", encoding="utf-8") as f:
-        f.write(str(jsonpickle.encode(task_info, indent=4)))
+    write_tasks_file(task_info)
     logger.info(f"提醒任务文件已保存到 {TASKS_FILE}")
 
 
+def add_task(task: Task):
+    """记录新任务并更新索引"""
+    task_info[task.task_id] = task
+    task_index.add(task)
+    list_cache.invalidate_task(task)
+
+
+def pop_task(task_id: str) -> Task | None:
+    """移除任务并更新索引，任务不存在时返回 None"""
+    task = task_info.pop(task_id, None)
+    if task is not None:
+        task_index.remove(task_id)
+        list_cache.invalidate_task(task)
+    return task
+
+
 async def get_user_nickname(group_id: int, user_id: int) -> str:
-    """获取用户昵称"""
-    try:
-        bot = nonebot.get_bot()
-        result = await bot.call_api("get_group_member_list", group_id=group_id)
-        logger.debug(result)
-        for member in result:
-            if member["user_id"] == user_id:
-                return member["card"] or member["nickname"] or member["user_id"]
-    except Exception as e:
-        logger.error(f"获取用户昵称失败: {e}")
-    return "未知用户"
-    
+    """获取用户昵称，结果按群缓存"""
+    return await nickname_cache.get(group_id, user_id)
 
 
 async def at_to_text(group_id: int, user_ids: Message) -> str:
@@ -72,6 +91,20 @@ async def at_to_text(group_id: int, user_ids: Message) -> str:
     return "".join(parts)
 
 
+async def render_task_texts(tasks: list[Task]) -> list[str]:
+    """并发将任务的被提醒人和提醒内容转换为展示文本，结果与 tasks 顺序一致"""
+    semaphore = asyncio.Semaphore(RENDER_CONCURRENCY)
+
+    async def render(task: Task) -> str:
+        # 将其中的at改为纯文本，避免打扰别人
+        group_id = task.group_id if task.is_group else None
+        async with semaphore:
+            text = await at_to_text(group_id, task.user_ids)
+        return text + str(task.reminder_message)
+
+    return await asyncio.gather(*(render(task) for task in tasks))
+
+
 def format_timedelta(td: timedelta):
     def add_unit(value, unit, result: list):
         if value:
@@ -90,70 +123,55 @@ def format_timedelta(td: timedelta):
     return "".join(parts) or f"{int(td.total_seconds())}秒"
 
 
-def get_user_tasks(user_id: str, group_id: int | None, sort: bool) -> list[dict]:
-    """从全局变量task_info获取用户的单次提醒任务
+def _query_user_tasks(
+    user_id: int, group_id: int | None, task_type: TaskType, sort: bool
+) -> list[Task]:
+    """sqlite 模式下通过索引查询用户任务"""
+    task_ids = query_task_ids(
+        user_id,
+        group_id,
+        task_type.value,
+        sort=sort,
+        private_list_all=remind_config.private_list_all,
+    )
+    return [task_info[tid] for tid in task_ids if tid in task_info]
+
+
+def _index_user_tasks(
+    user_id: int, group_id: int | None, task_type: TaskType, sort: bool
+) -> list[Task]:
+    """通过内存索引查询用户任务"""
+    # 私聊仅列出私聊提醒时，私聊提醒的 group_id 即为用户 id
+    if group_id is None and not remind_config.private_list_all:
+        group_id = user_id
+    task_ids = task_index.user_task_ids(user_id, group_id, task_type, sort)
+    return [task_info[tid] for tid in task_ids]
+
+
+def get_user_tasks(user_id: int, group_id: int | None, sort: bool) -> list[Task]:
+    """获取用户的单次提醒任务
 
     参数：
-        user_id:str 提醒人用户id
+        user_id:int 提醒人用户id
         group_id:int 群聊id, 私聊为None
         sort:bool 是否采用排序后的id
     返回：
         任务列表
     """
-    # 私聊列出所有提醒
-    if remind_config.private_list_all:
-        user_tasks = [
-            task
-            for task in task_info.values()
-            if task["reminder_user_id"] == user_id
-            and task["type"] == "datetime"
-            and (group_id is None or task["group_id"] == group_id)
-        ]
-    # 私聊仅列出私聊提醒
-    else:
-        user_tasks = [
-            task
-            for task in task_info.values()
-            if task["reminder_user_id"] == user_id
-            and task["type"] == "datetime"
-            and (
-                (group_id is None and task["group_id"] == int(user_id))
-                or task["group_id"] == group_id
-            )
-        ]
-    if sort:
-        user_tasks.sort(key=lambda x: x["remind_time"])
-    return user_tasks
-
-
-def get_user_cron_tasks(user_id: str, group_id: int | None) -> list[dict]:
-    """从全局变量task_info获取用户的循环提醒任务
+    if remind_config.remind_storage == "sqlite":
+        return _query_user_tasks(user_id, group_id, TaskType.DATETIME, sort)
+    return _index_user_tasks(user_id, group_id, TaskType.DATETIME, sort)
+
+
+def get_user_cron_tasks(user_id: int, group_id: int | None) -> list[Task]:
+    """获取用户的循环提醒任务
 
     参数：
-        user_id:str 提醒人用户id
+        user_id:int 提醒人用户id
         group_id:int 群聊id, 私聊为None
     返回：
         任务列表
     """
-    # 私聊列出所有提醒
-    if remind_config.private_list_all:
-        user_tasks = [
-            task
-            for task in task_info.values()
-            if task["reminder_user_id"] == user_id
-            and task["type"] == "CronTrigger"
-            and (group_id is None or task["group_id"] == group_id)
-        ]
-    # 私聊仅列出私聊提醒
-    else:
-        user_tasks = [
-            task
-            for task in task_info.values()
-            if task["reminder_user_id"] == user_id
-            and task["type"] == "CronTrigger"
-            and (
-                (group_id is None and task["group_id"] == int(user_id))
-                or task["group_id"] == group_id
-            )
-        ]
-    return user_tasks
+    if remind_config.remind_storage == "sqlite":
+        return _query_user_tasks(user_id, group_id, TaskType.CRON, False)
+    return _index_user_tasks(user_id, group_id, TaskType.CRON, False)
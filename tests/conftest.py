@@ -0,0 +1,35 @@
+"""测试的公共配置。
+
+插件依赖 NoneBot 配置和 localstore，在导入插件模块前先以无驱动模式初始化 NoneBot，
+数据目录放在临时目录中，不会影响本机机器人的任务文件。
+"""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import nonebot
+import pytest
+from nonebot.adapters.onebot.v11 import Adapter
+
+_store_dir = Path(tempfile.mkdtemp(prefix="remind-test-"))
+nonebot.init(
+    driver="~none",
+    log_level="WARNING",
+    localstore_data_dir=str(_store_dir / "data"),
+    localstore_cache_dir=str(_store_dir / "cache"),
+    localstore_config_dir=str(_store_dir / "config"),
+    localstore_use_cwd=False,
+)
+nonebot.get_driver().register_adapter(Adapter)
+nonebot.load_plugin("nonebot_plugin_remind")
+
+from glm_server import serve_glm  # noqa: E402
+
+
+@pytest.fixture
+def glm_server(monkeypatch: pytest.MonkeyPatch):
+    """代替智谱接口的本地 HTTP 服务"""
+    with serve_glm(monkeypatch) as server:
+        yield server
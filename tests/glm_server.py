@@ -0,0 +1,135 @@
+"""代替智谱接口的本地 HTTP 服务，供 GLM-4 相关的测试和基准测试使用。
+
+每个请求延迟 latency 秒后回复：单条解析一律回复 ANSWER；
+批量解析（用户消息为 JSON 数组）逐条回复 ANSWER，含 MALFORMED 的条目回复无法识别的内容。
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nonebot_plugin_remind import glm4
+from nonebot_plugin_remind.breaker import CircuitBreaker
+from nonebot_plugin_remind.config import remind_config
+
+ANSWER = "2026-10-18 08:00"
+# 批量回复中该条目的回复无法识别，需要单独重新解析
+MALFORMED = "乱码"
+LATENCY = 0.3
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: GLMServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _completion(self, content: str, **extra) -> dict:
+        return {
+            "id": "c1",
+            "created": 1,
+            "model": "glm-4-flash",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            **extra,
+        }
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        content = self.server.record(request["messages"][-1]["content"])
+        time.sleep(self.server.latency)
+        if "async" in self.path:
+            task_id = uuid.uuid4().hex
+            self.server.results[task_id] = content
+            self._send_json(
+                {"id": task_id, "task_status": "PROCESSING", "model": "glm-4-flash"}
+            )
+        elif request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for part in (content[:5], content[5:]):
+                chunk = {
+                    "id": "c1",
+                    "created": 1,
+                    "model": "glm-4-flash",
+                    "choices": [{"index": 0, "delta": {"content": part}}],
+                }
+                self.wfile.write(
+                    f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode()
+                )
+            self.wfile.write(b"data: [DONE]\n\n")
+        else:
+            self._send_json(self._completion(content))
+
+    def do_GET(self):
+        time.sleep(self.server.latency / 2)
+        content = self.server.results.pop(self.path.rsplit("/", 1)[-1])
+        self._send_json(self._completion(content, task_status="SUCCESS"))
+
+
+class GLMServer(ThreadingHTTPServer):
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        # 按到达顺序记录的用户消息
+        self.requests: list[str] = []
+        # 异步补全的任务ID → 回复
+        self.results: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, text: str) -> str:
+        """记录请求并返回回复内容"""
+        with self._lock:
+            self.requests.append(text)
+        if not text.startswith("["):
+            return ANSWER
+        answers = [
+            "明天早上" if MALFORMED in item else ANSWER for item in json.loads(text)
+        ]
+        return json.dumps(answers, ensure_ascii=False)
+
+
+@contextmanager
+def serve_glm(monkeypatch: pytest.MonkeyPatch) -> Iterator[GLMServer]:
+    """启动本地服务，并让 GLM-4 客户端连接到该服务，退出时恢复原有配置"""
+    server = GLMServer(LATENCY)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv(
+        "ZHIPUAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/api/paas/v4"
+    )
+    monkeypatch.setattr(glm4, "GLM_API_KEY", "id.secret")
+    monkeypatch.setattr(glm4, "GLM_4_MODEL", "glm-4-flash")
+    monkeypatch.setattr(glm4, "_gate", None)
+    monkeypatch.setattr(glm4, "_breaker", CircuitBreaker(3, 60))
+    monkeypatch.setattr(remind_config, "glm_batch_window", 0)
+    monkeypatch.setattr(remind_config, "glm_timeout", 5)
+    glm4.close_glm_client()
+    try:
+        yield server
+    finally:
+        glm4.close_glm_client()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,50 @@
+"""任务序列化的测试：循环提醒的起止时间和随机延迟在保存后应能还原。"""
+
+from __future__ import annotations
+
+import json
+
+from apscheduler.triggers.cron import CronTrigger
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+
+from nonebot_plugin_remind.codec import decode_tasks, encode_tasks
+from nonebot_plugin_remind.model import Task, TaskType
+
+
+def _round_trip(trigger: CronTrigger) -> CronTrigger:
+    task = Task(
+        task_id="cron",
+        reminder_user_id=1,
+        user_ids=Message(MessageSegment.at(1)),
+        type=TaskType.CRON,
+        remind_time=trigger,
+        reminder_message=Message("喝水"),
+        is_group=True,
+        group_id=123,
+    )
+    text = json.dumps(json.loads(encode_tasks({"cron": task})))
+    return decode_tasks(text)["cron"].remind_time
+
+
+def test_cron_keeps_start_end_and_jitter():
+    trigger = CronTrigger(
+        hour=8,
+        start_date="2026-11-01 00:00:00",
+        end_date="2027-01-01 00:00:00",
+        jitter=30,
+        timezone="Asia/Shanghai",
+    )
+    restored = _round_trip(trigger)
+    assert str(restored) == str(trigger)
+    assert restored.start_date == trigger.start_date
+    assert restored.end_date == trigger.end_date
+    assert restored.jitter == 30
+
+
+def test_plain_cron_round_trip():
+    trigger = CronTrigger(day_of_week="mon-fri", hour=9, timezone="Asia/Shanghai")
+    restored = _round_trip(trigger)
+    assert str(restored) == str(trigger)
+    assert restored.start_date is None
+    assert restored.end_date is None
+    assert restored.jitter is None
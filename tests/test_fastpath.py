@@ -0,0 +1,120 @@
+"""快速解析与 jionlp 的一致性测试。
+
+快速解析得出结果的表达式，jio.parse_time 必须得出相同的起始时间；
+jionlp 解析出错的表达式，快速解析必须返回 None 交给后续流程处理。
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+from datetime import datetime
+
+import pytest
+
+from nonebot_plugin_remind.fastpath import fast_parse_time
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import jionlp as jio
+
+_HOURS = [str(h) for h in range(25)] + ["一", "两", "三", "九", "十", "十二", "二十", "二十三"]
+_PERIODS = ["", "凌晨", "早上", "早晨", "上午", "中午", "下午", "傍晚", "晚上"]
+_DAYS = ["", "今天", "明天", "后天", "大后天", "今晚"]
+_REL_NUMS = ["1", "2", "10", "30", "59", "90", "一", "两", "三", "十", "十五", "二十", "半"]
+_REL_UNITS = ["小时", "个小时", "钟头", "个钟头", "分钟", "分", "秒", "秒钟", "个半小时", "个半钟头"]
+_DATES = [
+    # 没有年份的"."分隔更可能是时刻
+    "8.30",
+    "12.25",
+    "9.15",
+    "11.11",
+    "22.35",
+    "3-15",
+    "1-1",
+    "3/15",
+    "12/25",
+    "2026-3-15",
+    "2026/3/15",
+    "2026.3.15",
+    "2026.12.25",
+    "2026年3月15日",
+    "3月15日",
+    "3月15号",
+    "12月31日",
+    "2027年1月1日",
+    "2026-2-30",
+    "2026-13-1",
+]
+_DATE_CLOCKS = ["", "9:00", "9点", "3点半", "10点15分", " 9:00"]
+
+# 覆盖凌晨、上午、下午、深夜的当前时刻
+BASES = [datetime(2026, 10, 17, hour, 17, 33) for hour in (1, 9, 16, 23)]
+
+
+def _corpus() -> list[str]:
+    clocks = []
+    for h in _HOURS:
+        clocks += [f"{h}点", f"{h}点半", f"{h}点整", f"{h}点05", f"{h}点5分", f"{h}时", f"{h}时30分"]
+        if h.isdigit():
+            clocks += [f"{h}:00", f"{h}:45"]
+    corpus = [d + p + c for d in _DAYS for p in _PERIODS for c in clocks]
+    corpus += _DAYS + ["明天下午"]
+    corpus += [
+        n + unit + suffix
+        for n in _REL_NUMS
+        for unit in _REL_UNITS
+        for suffix in ("后", "之后", "以后")
+    ]
+    corpus += ["一刻钟后", "两刻钟后", "三刻钟后", "3天后", "半个小时后"]
+    corpus += [
+        d + p + c for d in _DATES for p in ("", "下午", "晚上") for c in _DATE_CLOCKS
+    ]
+    return corpus
+
+
+CORPUS = _corpus()
+
+
+def _jionlp_start(text: str, base: datetime) -> datetime | None:
+    try:
+        result = jio.parse_time(text, time_base=base.timestamp())
+    except Exception:
+        return None
+    if result["type"] not in ("time_point", "time_span"):
+        return None
+    return datetime.strptime(result["time"][0], "%Y-%m-%d %H:%M:%S")
+
+
+@pytest.mark.parametrize("base", BASES, ids=lambda base: base.strftime("%H:%M"))
+def test_matches_jionlp(base: datetime):
+    mismatches = []
+    for text in CORPUS:
+        fast = fast_parse_time(text, base)
+        if fast is not None and fast != _jionlp_start(text, base):
+            mismatches.append((text, fast, _jionlp_start(text, base)))
+    assert mismatches == []
+
+
+def test_corpus_mostly_fast():
+    """语料中的常见表达式大部分应由快速解析得出结果"""
+    base = BASES[1]
+    fast = sum(fast_parse_time(text, base) is not None for text in CORPUS)
+    assert fast > len(CORPUS) * 0.3
+
+
+@pytest.mark.parametrize("text", ["8.30", "12.25", "9.15", "11.11", "22.35"])
+def test_yearless_dot_is_not_a_date(text: str):
+    assert fast_parse_time(text, BASES[1]) is None
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("2026.12.25 9:00", datetime(2026, 12, 25, 9, 0)),
+        ("3-15", datetime(2026, 3, 15, 0, 0)),
+        ("3/15 9点", datetime(2026, 3, 15, 9, 0)),
+        ("12月31日下午3点半", datetime(2026, 12, 31, 15, 30)),
+    ],
+)
+def test_dates(text: str, expected: datetime):
+    assert fast_parse_time(text, BASES[1]) == expected
@@ -0,0 +1,118 @@
+"""GLM-4 调用的测试。
+
+用本地 HTTP 服务代替智谱接口（glm_server.py），每个请求延迟 0.3 秒后回复：
+解析期间事件循环中的其他协程应能持续运行；同时到达的请求合并为一次调用，
+批量回复中无法识别的条目单独重新解析，每个调用者的总用时不超过 glm_timeout。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+from glm_server import ANSWER, LATENCY, MALFORMED
+
+from nonebot_plugin_remind import glm4
+from nonebot_plugin_remind.config import remind_config
+
+
+def _run(coro):
+    # 超时后线程中的请求仍在进行，关闭事件循环时不等待这些线程
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _parse_while_ticking(text: str) -> tuple[str, float, float]:
+    """解析期间每 10 毫秒运行一次其他协程，返回 (解析结果, 解析用时, 两次运行的最大间隔)"""
+    ticks: list[float] = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    try:
+        result = await glm4.parsed_datetime_glm4(text)
+    finally:
+        elapsed = time.perf_counter() - start
+        task.cancel()
+    ticks.append(time.perf_counter())
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    return result, elapsed, max(gaps)
+
+
+async def _parse_concurrently(texts: list[str]) -> tuple[list[str], list[float]]:
+    """同时解析多条文本，返回各自的结果和用时"""
+
+    async def parse(text: str) -> tuple[str, float]:
+        start = time.perf_counter()
+        result = await glm4.parsed_datetime_glm4(text)
+        return result, time.perf_counter() - start
+
+    results = await asyncio.gather(*map(parse, texts))
+    return [result for result, _ in results], [elapsed for _, elapsed in results]
+
+
+@pytest.mark.parametrize("mode", ["async", "sync", "stream"])
+def test_event_loop_keeps_running(glm_server, monkeypatch: pytest.MonkeyPatch, mode):
+    monkeypatch.setattr(remind_config, "glm_completion_mode", mode)
+    result, elapsed, max_gap = _run(_parse_while_ticking("明天早上八点"))
+    assert result == ANSWER
+    assert elapsed >= LATENCY
+    # 阻塞事件循环时其他协程会停顿整个请求的时长
+    assert max_gap < LATENCY / 2
+
+
+def test_timeout_returns_without_waiting_for_request(
+    glm_server, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(remind_config, "glm_completion_mode", "sync")
+    monkeypatch.setattr(remind_config, "glm_timeout", 0.1)
+    result, elapsed, max_gap = _run(_parse_while_ticking("明天早上八点"))
+    assert result == "Timeout"
+    assert elapsed < LATENCY
+    assert max_gap < LATENCY / 2
+
+
+def test_lone_request_skips_batch_window(glm_server, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(remind_config, "glm_completion_mode", "sync")
+    monkeypatch.setattr(remind_config, "glm_batch_window", 1)
+    results, elapsed = _run(_parse_concurrently(["明天早上八点"]))
+    assert results == [ANSWER]
+    assert elapsed[0] < LATENCY + 0.5
+
+
+@pytest.mark.parametrize("mode", ["async", "sync"])
+def test_batch_falls_back_for_malformed_item(
+    glm_server, monkeypatch: pytest.MonkeyPatch, mode
+):
+    monkeypatch.setattr(remind_config, "glm_completion_mode", mode)
+    monkeypatch.setattr(remind_config, "glm_batch_window", 0.05)
+    texts = ["明天早上八点", "后天早上八点", f"{MALFORMED}大后天", "下周一早上八点"]
+    results, _ = _run(_parse_concurrently(texts))
+    assert results == [ANSWER] * len(texts)
+    # 第一条没有可合并的请求，直接发送；其余合并为一次调用，无法识别的一条再单独解析
+    assert glm_server.requests == [
+        texts[0],
+        json.dumps(texts[1:], ensure_ascii=False),
+        texts[2],
+    ]
+
+
+def test_fallback_shares_caller_deadline(glm_server, monkeypatch: pytest.MonkeyPatch):
+    """等待合并、批量请求和重新解析共用 glm_timeout，重新解析来不及完成时返回 Timeout"""
+    monkeypatch.setattr(remind_config, "glm_completion_mode", "sync")
+    monkeypatch.setattr(remind_config, "glm_batch_window", 0.05)
+    monkeypatch.setattr(remind_config, "glm_timeout", LATENCY * 2)
+    texts = ["明天早上八点", "后天早上八点", f"{MALFORMED}大后天"]
+    results, elapsed = _run(_parse_concurrently(texts))
+    assert results == [ANSWER, ANSWER, "Timeout"]
+    assert max(elapsed) < LATENCY * 2 + 0.1
@@ -0,0 +1,105 @@
+"""提醒发送的测试。
+
+用假的 bot 代替协议端：发送接口超时的提醒可能已经送达，不应重发；
+合并发送失败时整个批次只补发一条附带错误信息的消息。
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import nonebot
+import pytest
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+
+from nonebot_plugin_remind import data_sourse
+from nonebot_plugin_remind.batcher import GroupReminderBatcher
+from nonebot_plugin_remind.config import remind_config
+from nonebot_plugin_remind.ratelimit import SendLimiter
+
+TIMEOUT = 0.05
+WINDOW = 0.02
+
+
+class FakeBot:
+    def __init__(self, mode: str):
+        """mode 为 hang 时发送接口不返回，为 fail 时不带错误信息的消息发送失败"""
+        self.mode = mode
+        self.sent: list[str] = []
+
+    async def _send(self, message: Message):
+        self.sent.append(str(message))
+        if self.mode == "hang":
+            await asyncio.sleep(10)
+        if self.mode == "fail" and "RuntimeError" not in str(message):
+            raise RuntimeError("发送失败")
+
+    async def send_group_msg(self, group_id: int, message: Message):
+        await self._send(message)
+
+    async def send_private_msg(self, user_id: int, message: Message):
+        await self._send(message)
+
+
+@pytest.fixture
+def use_bot(monkeypatch: pytest.MonkeyPatch):
+    def use(mode: str, merge_window: float = 0) -> FakeBot:
+        bot = FakeBot(mode)
+        monkeypatch.setattr(nonebot, "get_bot", lambda: bot)
+        monkeypatch.setattr(
+            data_sourse, "send_limiter", SendLimiter(0, 1, 0, 1, 4, TIMEOUT)
+        )
+        monkeypatch.setattr(
+            data_sourse,
+            "group_batcher",
+            GroupReminderBatcher(data_sourse._send_group_msg, lambda: WINDOW),
+        )
+        monkeypatch.setattr(remind_config, "remind_merge_window", merge_window)
+        return bot
+
+    return use
+
+
+def _remind(*texts: str, is_group: bool = True):
+    async def main():
+        await asyncio.gather(
+            *(
+                data_sourse.send_reminder(
+                    f"task{i}",
+                    Message(MessageSegment.at(i + 1)),
+                    Message(text),
+                    is_group,
+                    123,
+                )
+                for i, text in enumerate(texts)
+            )
+        )
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    ("is_group", "merge_window"), [(True, 0), (True, WINDOW), (False, 0)]
+)
+def test_timeout_is_not_resent(use_bot, is_group: bool, merge_window: float):
+    bot = use_bot("hang", merge_window)
+    _remind("喝水", is_group=is_group)
+    assert bot.sent == ["[CQ:at,qq=1]喝水" if is_group else "喝水"]
+
+
+def test_failed_send_falls_back(use_bot):
+    bot = use_bot("fail")
+    _remind("喝水")
+    assert len(bot.sent) == 2
+    assert "RuntimeError: 发送失败" in bot.sent[1]
+    assert "喝水" in bot.sent[1]
+
+
+def test_failed_batch_sends_one_fallback(use_bot):
+    bot = use_bot("fail", WINDOW)
+    _remind("喝水", "吃饭", "睡觉")
+    assert len(bot.sent) == 2
+    fallback = bot.sent[1]
+    assert fallback.startswith("[CQ:at,qq=1][CQ:at,qq=2][CQ:at,qq=3]\n")
+    assert "RuntimeError: 发送失败" in fallback
+    assert all(text in fallback for text in ("喝水", "吃饭", "睡觉"))